@@ -1,97 +1,157 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import time
 import threading
-from queue import Queue, Full, Empty
+import multiprocessing
 
-from flask import Flask, Response, request, jsonify, render_template_string
-
-from picamera2 import Picamera2
+# Flask ve picamera2 burada içe aktarılmaz: ağır içe aktarmalar (web, kamera, tabela modeli)
+# motorlar hazır olduktan sonra yapılır (bkz. start_threads, FAST_START)
 import cv2
 import numpy as np
 
-from SeritGoruntu import SeritTakip
+from SeritGoruntu import SeritTakip, segmentleri_siniflandir
 from Servo_Kontrol import ServoKontrol
+from direksiyon import DireksiyonAktuator
+from yayin import YayinMerkezi
+from ws_sunucu import WsSunucu
+from komut_kanali import KomutKanali
 from dc_motor import Vehicle
+from durum import PaylasimliDurum
+from tabela import TabelaDedektoru, TabelaGirdisi, TespitOnbellegi
+from hiz_politikasi import HizPolitikasi
+from olcum import AsamaProfil, BaslangicCizelgesi, GecikmeIzi
+from kare_halkasi import KareHalkasi
+from metrikler import (HizSayaci, Histogram, MetrikYazici, KISILMA_BITLERI,
+                       cpu_sicaklik, kisilma_durumu)
+from surecler import (HalkaYayini, UzakTabela, UzakKomut, durum_yayinla, komut_dinle,
+                      durum_al, halka_besle, tabela_sureci)
+
+# Açılış zaman çizelgesi (süreç başlangıcından itibaren; /api/startup)
+ZAMAN = BaslangicCizelgesi()
+ZAMAN.isaretle("imports")
 
 # ================== AYARLAR ==================
 SHOW_LOCAL = False         # HDMI ekranda görüntü göstermek istersen True yap
+FAST_START = True          # önce motorlar + kontrol döngüsü; web/yayın/tabela arka planda kurulur
+PROCESS_MODE = False       # True → web/yayın ve tabela ayrı süreçlerde (kareler paylaşımlı bellekle)
 HTTP_HOST = "0.0.0.0"
 HTTP_PORT = 5000
+WS_ENABLED = True          # viewer.html için asyncio WebSocket sunucusu
+WS_VIDEO_PORT = 8765       # ikili JPEG kareler
+WS_CTRL_PORT = 8766        # JSON kontrol + telemetri
+WS_TOKEN = os.environ.get("WS_TOKEN", "SECRET")   # viewer.html ?t=<token>
+WS_TLS = False             # True → certs/ ile wss (viewer https üzerinden açılmalı)
+WS_TELEMETRY_HZ = 5
+UDP_ENABLED = True         # düşük gecikmeli ikili komut kanalı (komut_kanali.py)
+UDP_PORT = 5005
+UDP_TOKEN = os.environ.get("CMD_TOKEN", "SECRET")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+VIEWER_HTML = os.path.join(BASE_DIR, "viewer.html")
+STEER_CONTINUOUS = True    # True → PID ile sürekli direksiyon, False → Sag/Sol/Duz üç konum
+CAPTURE_SIZE = (640, 480)
+CAPTURE_FORMAT = "RGB888"  # libcamera RGB888 = bellekte B,G,R → OpenCV BGR, dönüşüm gerekmez
+CAPTURE_SLOTS = 4          # kamera halkası yuvası (işlemenin kiraladığı yuva yazılmaz)
+ROI_CROP = True            # şerit işleme yalnız alt yarı dilimde (renk/blur/Canny yarı piksel)
+FRAME_BUDGET_S = 1 / 30.0  # işleme kare bütçesi; aşılırsa yayın kodlaması kısılır
+STREAM_ADAPTIVE = True     # /video_feed varsayılanı; ?adaptive=0 ile sabit kalite
+SIGN_ENABLED = True        # tabela/ışık dedektörü (model yoksa kendiliğinden kapanır)
+# model_aktar.py çıktısı varsa ONNX (torch yok, daha hızlı), yoksa PyTorch modeli
+SIGN_MODEL_ONNX = os.path.join(BASE_DIR, "weights", "best_320_int8.onnx")
+SIGN_MODEL = SIGN_MODEL_ONNX if os.path.exists(SIGN_MODEL_ONNX) else os.path.join(BASE_DIR, "weights", "best.pt")
+SIGN_THREADS = 2           # ONNX intra-op thread (kalan çekirdekler şerit döngüsüne)
+SIGN_HZ = 3.0              # çıkarım hızı üst sınırı (kamera hızının altında)
+SIGN_ROI = (0.5, 0.0, 1.0, 0.6)   # tabela bandı (x0, y0, x1, y1 oran); None → tam kare
+SIGN_IMGSZ = 320           # ROI küçük olduğundan 640 yerine (çıkarım ~4 kat ucuz)
+SIGN_VOTE = (2, 3)         # tabela, son M çıkarımın en az N'inde görülünce onaylanır
+TRACE_ENABLED = True       # kare başına gecikme izi (/api/trace); aşama ölçümü küçük ek yük getirir
+TRACE_SIZE = 512           # halkada tutulan son kare kaydı
+TRACE_DIR = os.path.join(BASE_DIR, "traces")   # /api/trace/dump ve çıkışta döküm klasörü
+TRACE_DUMP_ON_EXIT = False
+STATE_TELEMETRY_S = 1.0    # /api/state long-poll: telemetri (Δ, L/R, DROP) en sık bu aralıkla
+METRICS_ENABLED = True     # /metrics (Prometheus metin biçimi) için aşama/gecikme histogramları
 
 # ================== UZAKTAN KONTROL DURUMU ==================
-STATE = {
-    "mode": "AUTO",            # "AUTO" | "MANUAL" | "STOP"
-    "speed": "fast",           # "slow" | "normal" | "fast" | "stop"
-    "last_decision": "Duz git",
-    "last_seen": None,
-    "have_left": 0,
-    "have_right": 0,
-    "delta_px": 0,
-}
+# Sürümlü durum: okumalar kilitsiz anlık görüntü, yazımlar sürümü artırır (bkz. durum.py)
+STATE = PaylasimliDurum(
+    # her karede yazılan alanlar sürümü en fazla STATE_TELEMETRY_S'de bir artırır
+    telemetri=("last_seen", "have_left", "have_right", "delta_px", "steer", "dropped"),
+    telemetri_s=STATE_TELEMETRY_S,
+    mode="AUTO",               # "AUTO" | "MANUAL" | "STOP"
+    speed="fast",              # "slow" | "normal" | "fast" | "stop"
+    last_decision="Duz git",
+    last_seen=None,
+    have_left=0,
+    have_right=0,
+    delta_px=0,
+    steer=0.0,                 # sürekli direksiyon değeri [-1, 1]
+    dropped=0,                 # işlenmeden üzerine yazılan kamera karesi
+    sign=None,                 # hız politikasının aktif tepkisi ("DUR", "LIMIT30" ...)
+)
 
 # ================== GLOBAL NESNELER / KUYRUKLAR ==================
-app = Flask(__name__)
+app = None                 # web_uygulamasi() ile (arka planda) kurulur
 stop_event = threading.Event()
 
-# Kamera → işleme ham kare
-frame_q = Queue(maxsize=1)
-# İşleme → yayın overlay kare
-annot_q = Queue(maxsize=1)
+# Kamera → işleme: ön-ayrılmış kare halkası (kimlik + yakalama zamanı, atlanan kare sayacı)
+frame_ring = KareHalkasi((CAPTURE_SIZE[1], CAPTURE_SIZE[0], 3), n=CAPTURE_SLOTS)
+# İşleme → yayın: overlay kare bir kez JPEG'e çevrilip tüm izleyicilere dağıtılır
+yayin = YayinMerkezi(stop_event, quality=80, frame_budget_s=FRAME_BUDGET_S)
+
+# Gecikme izi: yakalama → alma → aşamalar → karar → aktüatör → overlay → yayın
+iz = GecikmeIzi(TRACE_SIZE)
+profil = AsamaProfil()
+
+# Metrikler: kayan pencereli hızlar + histogramlar (tek yazan, /metrics kilitsiz okur)
+hiz_yakalama = HizSayaci()
+hiz_isleme = HizSayaci()
+hiz_servo = HizSayaci()
+asama_hist = Histogram()       # SeritTakip aşamaları (sn)
+gecikme_hist = Histogram()     # yakalamadan alma / gönderim / yayına verişe (sn)
+
+# Tabela dedektörü (ayrı thread) + hız politikası
+tabela = None
+politika = HizPolitikasi(giris_sayisi=1)   # oylamayı TespitOnbellegi yapıyor
+
+# PROCESS_MODE: alt süreçler, paylaşımlı bellek halkaları, süreçler arası durdurma
+surecler = []
+halkalar = []
+surec_stop = None
+kontrol_sureci = True      # web sürecinde False: kamera/işleme sayaçları orada boş kopyadır
 
 # Donanım/sınıf nesneleri
 servo = None
+aktuator = None
 vehicle = None
 serit = None
 
 # ================== GÖRSEL YARDIMCI ==================
-def draw_lanes_on_frame(frame, lines, color=(0, 255, 0), show_segments=False):
+def draw_lanes_on_frame(frame, lines, color=(0, 255, 0), show_segments=False, lr=None):
+    """
+    lr: segmentleri_siniflandir sonucu (verilmezse burada hesaplanır).
+    Karar tarafı zaten sınıflandırdıysa aynı sonuç verilerek tekrar hesap önlenir.
+    """
     if lines is None or len(lines) == 0:
         return
 
     h, w = frame.shape[:2]
     overlay = frame.copy()
 
-    left_lines, right_lines = [], []
-
     if show_segments:
         for l in lines:
             x1, y1, x2, y2 = l[0]
             cv2.line(overlay, (x1, y1), (x2, y2), color, 2)
 
-    # Hough sınıflamasıyla aynı mantığı kullan (0.2 eşik, alt band)
-    y_band_top = int(h * 0.60)
-    y_band_bot = h - 1
-    xc = w / 2.0
+    # Hough sınıflamasıyla aynı mantık (0.2 eşik, alt band)
+    if lr is None:
+        lr = segmentleri_siniflandir(lines, h, w)
+    _, _, left_avg, right_avg = lr
 
-    def add_line(x1, y1, x2, y2):
-        if max(y1, y2) < y_band_top:
-            return
-        if x2 == x1:
-            m = 1e6
-        else:
-            m = (y2 - y1) / (x2 - x1)
-        b = y1 - m * x1
-        if abs(m) < 0.2:
-            y_eval = y_band_bot
-            x_eval = (y_eval - b)/m if abs(m) > 1e-6 else (x1+x2)/2.0
-            (left_lines if x_eval < xc else right_lines).append((m,b))
-        else:
-            if m < -0.2: left_lines.append((m,b))
-            elif m > 0.2: right_lines.append((m,b))
-
-    for l in lines:
-        x1, y1, x2, y2 = l[0]
-        add_line(x1, y1, x2, y2)
-
-    if len(left_lines) == 0 or len(right_lines) == 0:
+    if left_avg is None or right_avg is None:
         cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
         return
 
-    left_avg = np.average(left_lines, axis=0)
-    right_avg = np.average(right_lines, axis=0)
-
     def pts_from_mb(m, b, y_top, y_bot):
         if abs(m) < 1e-6:
             return None
@@ -128,52 +188,75 @@ def put_hud(frame, text, y):
 
 # ================== KAMERA THREAD ==================
 class CaptureThread(threading.Thread):
-    def __init__(self, queue: Queue, stop_event: threading.Event):
+    def __init__(self, halka: KareHalkasi, stop_event: threading.Event):
         super().__init__(daemon=True)
-        self.q = queue
+        from picamera2 import Picamera2, MappedArray
+
+        self.halka = halka
         self.stop_event = stop_event
+        self.MappedArray = MappedArray
         self.picam2 = Picamera2()
-        cfg = self.picam2.create_video_configuration(main={"size": (640, 480)})
+        # BGR sırasıyla doğrudan işlenebilir format → RGB→BGR dönüşümü/kopyası yok
+        cfg = self.picam2.create_video_configuration(
+            main={"size": CAPTURE_SIZE, "format": CAPTURE_FORMAT})
         self.picam2.configure(cfg)
 
     def run(self):
         self.picam2.start()
+        ZAMAN.isaretle("camera_started")
         time.sleep(0.4)
+        w, h = CAPTURE_SIZE
         try:
             while not self.stop_event.is_set():
-                frame_rgb = self.picam2.capture_array()
-                frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-
-                if self.q.full():
-                    try:
-                        self.q.get_nowait()
-                    except Empty:
-                        pass
+                request = self.picam2.capture_request()
+                t_yakalama = time.monotonic()
                 try:
-                    self.q.put_nowait(frame)
-                except Full:
-                    pass
+                    # kamera tamponundan (kopyasız view) halka yuvasına tek kopya;
+                    # işlenmemiş eski kare kuyruk dansı olmadan üzerine yazılır
+                    with self.MappedArray(request, "main") as m:
+                        self.halka.yaz(m.array[:h, :w, :3], t_yakalama)
+                finally:
+                    request.release()
+                hiz_yakalama.tik(t_yakalama)
         finally:
             try:
                 self.picam2.stop()
             except Exception:
                 pass
 
-# ================== İŞLEME / SÜRÜŞ THREAD ==================
-def processing_thread():
-    global servo, vehicle, serit, STATE
+# ================== DONANIM ==================
+def donanim_kur():
+    """ Servo + direksiyon aktüatörü + motorlar; açılışta ilk kurulan (komutlar hemen uygulanır). """
+    global servo, aktuator, vehicle, serit
 
-    servo = ServoKontrol()
+    # merkeze oturma beklemesi yok: aktüatör ilk komutu yerleşme süresiyle uygular
+    servo = ServoKontrol(baslangic_bekle=0 if FAST_START else 0.5)
+    aktuator = DireksiyonAktuator(servo,   # servo beklemesi işleme döngüsünü tutmasın
+                                  uygulandi_fn=servo_uygulandi)
+    aktuator.start()
     vehicle = Vehicle()
-    serit = SeritTakip(lane_width_px=300, center_deadband_px=40)
+    serit = SeritTakip(lane_width_px=300, center_deadband_px=40, roi_crop=ROI_CROP)
+    if TRACE_ENABLED or METRICS_ENABLED:
+        serit.profil = profil
+    ZAMAN.isaretle("motors_ready")
 
-    frame_count = 0
-    start_time = time.time()
+def servo_uygulandi(etiket, t):
+    """ Aktüatör thread'i: komut servoya gitti (komut hızı + gecikme izi). """
+    hiz_servo.tik(t)
+    if TRACE_ENABLED:
+        iz.servo(etiket, t)
+
+# ================== İŞLEME / SÜRÜŞ THREAD ==================
+def processing_thread():
+    kimlik = 0
 
     try:
         while not stop_event.is_set():
-            # Hız modu (her döngü)
+            # Hız modu (her döngü); AUTO'da tabela politikası hızı düşürebilir
             spd = STATE["speed"]
+            if tabela is not None and STATE["mode"] == "AUTO":
+                spd, neden = politika.hiz(spd, tabela.son_sonuc())
+                STATE["sign"] = neden
             if spd == "normal":
                 vehicle.forward_normal()
             elif spd == "fast":
@@ -183,63 +266,87 @@ def processing_thread():
             else:
                 vehicle.stop()
 
-            # Kuyruktan kare al
-            try:
-                frame = frame_q.get(timeout=0.2)
-            except Empty:
+            # Halkadan en yeni kareyi kirala (kopyasız; birak'a kadar yazan bu yuvayı atlar)
+            kimlik, t_yakalama, frame = frame_ring.al(kimlik, timeout=0.2)
+            if frame is None:
                 continue
-
-            frame_count += 1
+            t_alma = time.monotonic()
+            profil.basla()
+
+            t_frame = time.time()
+            hiz_isleme.tik(t_alma)
+            ZAMAN.isaretle("first_frame")
+            if tabela is not None and tabela.hazir:
+                ZAMAN.isaretle("detector_ready")
             h, w = frame.shape[:2]
 
+            # Tabela dedektörü alt hızda en yeni kareyi alır (kopya yalnız o zaman)
+            if tabela is not None and tabela.kare_istiyor():
+                tabela.kare_koy(frame, t_yakalama)
+
             # Şerit tespiti & karar (AUTO modda)
             karar = STATE["last_decision"]
-            lines = serit.get_lines(frame)
+            t_karar = t_gonderim = None
+            on = serit.on_isle(frame)   # HSV/maske/blur tek sefer; iki dedektör paylaşır
             if STATE["mode"] == "AUTO":
-                karar = serit.get_steering_decision(lines, w, h)
-                if (lines is None or len(lines) < 4) and karar == "Duz git":
-                    poly_out = serit.detect_lanes_poly(frame)
-                    karar = serit.decision_from_poly(poly_out)
-
-                # Servo komutları (AUTO)
-                if karar == "Sag":
-                    servo.saga_don()
-                elif karar == "Sol":
-                    servo.sola_don()
+                karar, lines = serit.karar_ver(on)
+                t_karar = time.monotonic()
+
+                # Servo komutları (AUTO) – beklemeden döner; kimlik servo anını ize bağlar
+                steer = STATE["steer"]
+                if STEER_CONTINUOUS:
+                    deger = serit.get_steering_value(karar)
+                    aktuator.aci(deger, kimlik)
+                    steer = round(deger, 2)
                 else:
-                    servo.duz_git()
+                    aktuator.komut(karar, kimlik)
+                t_gonderim = time.monotonic()
+                ZAMAN.isaretle("first_actuation")
 
-                STATE["last_decision"] = karar
+                STATE.guncelle(last_decision=karar, steer=steer)
+            else:
+                lines = serit.get_lines(on)   # yalnız overlay için
 
             # Overlay + HUD
             vis = frame.copy()
+            frame_ring.birak(kimlik)   # bundan sonra kare yuvası kullanılmıyor
+            frame = on = None
             # çizgiler
             if lines is not None:
-                draw_lanes_on_frame(vis, lines, color=(0, 255, 0), show_segments=False)
-
-            elapsed_time = time.time() - start_time
-            fps = frame_count / max(elapsed_time, 1e-6)
-
-            # HUD bilgileri
-            STATE["last_seen"]  = serit.last_seen
-            STATE["have_left"]  = int(serit.db_have_left)
-            STATE["have_right"] = int(serit.db_have_right)
-            STATE["delta_px"]   = int(serit.db_delta_px)
-
-            put_hud(vis, f"MODE:{STATE['mode']} SPEED:{STATE['speed']}", 40)
-            put_hud(vis, f"YON:{STATE['last_decision']} FPS:{fps:.1f}", 70)
-            put_hud(vis, f"L:{STATE['have_left']} R:{STATE['have_right']} Δ:{STATE['delta_px']} LAST:{STATE['last_seen']}", 100)
-
-            # MJPEG kuyruğu
-            if annot_q.full():
-                try:
-                    annot_q.get_nowait()
-                except Empty:
-                    pass
-            try:
-                annot_q.put_nowait(vis)
-            except Full:
-                pass
+                draw_lanes_on_frame(vis, lines, color=(0, 255, 0), show_segments=False,
+                                    lr=serit.siniflandir(lines, h, w))
+
+            fps = hiz_isleme.hiz(t_alma)   # son birkaç saniye (takılma gizlenmez)
+
+            # HUD bilgileri (tek sürümde)
+            STATE.guncelle(last_seen=serit.last_seen,
+                           have_left=int(serit.db_have_left),
+                           have_right=int(serit.db_have_right),
+                           delta_px=int(serit.db_delta_px),
+                           dropped=frame_ring.atlanan)
+            _, st = STATE.snapshot()   # HUD tek, tutarlı görüntüden okunur
+
+            put_hud(vis, f"MODE:{st['mode']} SPEED:{st['speed']}" + (f" SIGN:{st['sign']}" if st['sign'] else ""), 40)
+            put_hud(vis, f"YON:{st['last_decision']} STEER:{st['steer']:+.2f} FPS:{fps:.1f}", 70)
+            put_hud(vis, f"L:{st['have_left']} R:{st['have_right']} Δ:{st['delta_px']} LAST:{st['last_seen']} DROP:{st['dropped']}", 100)
+            t_overlay = time.monotonic()
+
+            # MJPEG yayını (izleyici yoksa kodlanmaz)
+            yayin.kare_koy(vis)
+            yayin.isleme_bildir(time.time() - t_frame)
+            t_yayin = time.monotonic()
+
+            sureler = profil.bitir()
+            if METRICS_ENABLED:
+                for ad, sn in sureler.items():
+                    asama_hist.gozlem(ad, sn)
+                gecikme_hist.gozlem("dequeue", t_alma - t_yakalama)
+                if t_gonderim is not None:
+                    gecikme_hist.gozlem("dispatch", t_gonderim - t_yakalama)
+                gecikme_hist.gozlem("publish", t_yayin - t_yakalama)
+            if TRACE_ENABLED:
+                iz.ekle((kimlik, t_yakalama, t_alma, t_karar, t_gonderim, t_overlay,
+                         t_yayin, karar, sureler, getattr(yayin, "son_kodlama_s", None)))
 
             # İsteğe bağlı yerel pencere
             if SHOW_LOCAL:
@@ -248,26 +355,22 @@ def processing_thread():
                     break
 
     finally:
+        aktuator.durdur()
         vehicle.stop()
         if SHOW_LOCAL:
             cv2.destroyAllWindows()
 
 # ================== MJPEG ÜRETİCİ ==================
-def mjpeg_generator():
-    while not stop_event.is_set():
-        try:
-            frame = annot_q.get(timeout=0.2)
-        except Empty:
-            continue
-        ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-        if not ok:
-            continue
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + jpg.tobytes() + b'\r\n')
+def mjpeg_generator(adaptive=True):
+    # her istemci aynı kodlanmış JPEG'i alır; yavaş istemci kare atlar,
+    # uyarlamalı modda kalite/ölçek/FPS bağlantıya göre düşer
+    return yayin.abone(adaptif=adaptive)
 
 # ================== FLASK ROUTES ==================
-@app.route("/")
+# Flask yalnız web_uygulamasi() çağrılınca içe aktarılır; görünümler flask adlarını yerel alır.
 def index():
+    from flask import render_template_string
+
     # Basit gömülü arayüz (ayrı template dosyası istemeden)
     html = """
     <!doctype html>
@@ -333,76 +436,363 @@ def index():
         function setMode(mode){ postJSON('/api/cmd', {mode}); }
         function setSpeed(speed){ postJSON('/api/cmd', {speed}); }
         function steer(steer){ postJSON('/api/cmd', {steer}); }
-        // ilk durum
-        postJSON('/api/cmd', {});
+        // durum: yalnız değiştiğinde dönen long-poll
+        async function poll(){
+          let since = -1;
+          while(true){
+            try{
+              const r = await fetch(`/api/state?since=${since}&timeout=15`);
+              const s = await r.json(); show(s); since = s.version;
+            }catch(e){ await new Promise(ok=>setTimeout(ok,1000)); }
+          }
+        }
+        poll();
       </script>
     </body></html>
     """
     return render_template_string(html)
 
-@app.route("/video_feed")
 def video_feed():
-    return Response(mjpeg_generator(), mimetype="multipart/x-mixed-replace; boundary=frame")
+    from flask import Response, request
+
+    adaptive = request.args.get("adaptive", "1" if STREAM_ADAPTIVE else "0") != "0"
+    return Response(mjpeg_generator(adaptive), mimetype="multipart/x-mixed-replace; boundary=frame")
 
-@app.route("/api/cmd", methods=["POST"])
-def api_cmd():
+def komut_uygula(data):
     """
-    JSON Body örnekleri:
+    HTTP, WebSocket ve diğer kanallardan gelen komutların ortak uygulayıcısı.
       {"mode":"AUTO"} | {"mode":"MANUAL"} | {"mode":"STOP"}
       {"speed":"slow|normal|fast|stop"}
-      {"steer":"left|right|center"}  # MANUAL modda
+      {"steer":"left|right|center"} | {"steer": -1.0..1.0}  # MANUAL modda
+    Değişiklikler tek sürümde yayınlanır; DÖNÜŞ: sürümlü durum sözlüğü.
     """
-    data = request.get_json(force=True, silent=True) or {}
+    degisen = {}
 
     # Mod
     if "mode" in data:
-        mode = data["mode"].upper()
+        mode = str(data["mode"]).upper()
         if mode in ("AUTO", "MANUAL", "STOP"):
-            STATE["mode"] = mode
+            degisen["mode"] = mode
             if mode == "STOP":
-                STATE["speed"] = "stop"
+                degisen["speed"] = "stop"
                 try: vehicle.stop()
                 except Exception: pass
 
     # Hız
-    if "speed" in data:
-        spd = data["speed"].lower()
+    if "speed" in data and "speed" not in degisen:
+        spd = str(data["speed"]).lower()
         if spd in ("slow", "normal", "fast", "stop"):
-            STATE["speed"] = spd
+            degisen["speed"] = spd
 
     # Manuel direksiyon
-    if "steer" in data and STATE["mode"] == "MANUAL":
-        steer = data["steer"].lower()
-        if steer == "left":
-            servo.sola_don()
-            STATE["last_decision"] = "Sol(M)"
-        elif steer == "right":
-            servo.saga_don()
-            STATE["last_decision"] = "Sag(M)"
-        elif steer == "center":
-            servo.duz_git()
-            STATE["last_decision"] = "Duz(M)"
-
-    return jsonify(STATE)
+    if "steer" in data and degisen.get("mode", STATE["mode"]) == "MANUAL":
+        steer = data["steer"]
+        if isinstance(steer, (int, float)) and not isinstance(steer, bool):
+            deger = max(-1.0, min(1.0, float(steer)))
+            aktuator.aci(deger)
+            if serit is not None:
+                serit.pid.konum(deger)   # AUTO'ya dönüşte PID buradan, hız sınırlı devam eder
+            degisen["steer"] = round(deger, 2)
+            degisen["last_decision"] = "Aci(M)"
+        else:
+            steer = str(steer).lower()
+            konum = None
+            if steer == "left":
+                aktuator.komut("Sol")
+                degisen["last_decision"] = "Sol(M)"
+                konum = -1.0
+            elif steer == "right":
+                aktuator.komut("Sag")
+                degisen["last_decision"] = "Sag(M)"
+                konum = 1.0
+            elif steer == "center":
+                aktuator.komut("Duz git")
+                degisen["last_decision"] = "Duz(M)"
+                konum = 0.0
+            if konum is not None and serit is not None:
+                serit.pid.konum(konum)
+
+    if degisen:
+        STATE.guncelle(**degisen)
+    return STATE.sozluk()
+
+def api_state():
+    """
+    Long-poll: /api/state?since=<version>&timeout=<sn>
+    Sürüm since'ten büyükse hemen, değilse değişiklik (ya da timeout) olunca döner.
+    Telemetri alanları sürümü en fazla STATE_TELEMETRY_S'de bir artırır.
+    """
+    from flask import jsonify, request
+
+    since = request.args.get("since", type=int)
+    if since is not None:
+        timeout = min(max(request.args.get("timeout", 10.0, type=float), 0.0), 30.0)
+        STATE.bekle(since, timeout)
+    return jsonify(STATE.sozluk())
+
+def viewer():
+    # WebSocket izleyicisi (video 8765, kontrol/telemetri 8766)
+    from flask import send_file
+
+    return send_file(VIEWER_HTML)
+
+def api_trace():
+    """
+    /api/trace?n=<kayıt>  → {"summary": olay başına p50/p95/p99 (ms), "records": [...]}
+    Süreler karenin yakalanmasına göredir; stages_ms SeritTakip aşamalarıdır.
+    """
+    from flask import jsonify, request
+
+    n = request.args.get("n", 100, type=int)
+    kayitlar = iz.kayitlar()
+    return jsonify({"enabled": TRACE_ENABLED, "summary": iz.ozet(kayitlar),
+                    "records": kayitlar[-n:] if n > 0 else []})
+
+def iz_dok():
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    yol = os.path.join(TRACE_DIR, time.strftime("trace_%Y%m%d_%H%M%S.jsonl"))
+    return yol, iz.dosyaya_yaz(yol)
+
+def api_trace_dump():
+    """ POST: tüm izi TRACE_DIR altına JSON Lines olarak yazar. """
+    from flask import jsonify
+
+    yol, sayi = iz_dok()
+    return jsonify({"path": yol, "records": sayi})
+
+def metrikler_metni():
+    """
+    /metrics gövdesi. PROCESS_MODE'da web sürecinde yalnız yayın ve Pi sağlığı yazılır;
+    kamera/işleme serileri orada 0 görünüp duraklama sanılmasın diye hiç üretilmez.
+    """
+    m = MetrikYazici()
+    now = time.monotonic()
+    kaynaklar = [("stream", getattr(yayin, "hiz", None))]
+    if kontrol_sureci:
+        kaynaklar = [("capture", hiz_yakalama), ("processing", hiz_isleme)] + kaynaklar
+    for kaynak, sayac in kaynaklar:
+        if sayac is not None:
+            m.gauge("fps", round(sayac.hiz(now), 2), "Kayan pencereli kare hızı (5 sn).", kaynak=kaynak)
+
+    if kontrol_sureci:
+        m.counter("frames_captured_total", frame_ring.yazilan, "Halkaya yazılan kamera karesi.")
+        m.counter("frames_processed_total", frame_ring.alinan, "İşleme döngüsünün aldığı kare.")
+        m.counter("frames_dropped_total", frame_ring.atlanan,
+                  "İşlenmeden üzerine yazılan / istemcinin kaçırdığı kare.", queue="camera")
+    if hasattr(yayin, "atlanan"):
+        m.counter("frames_dropped_total", yayin.atlanan,
+                  "İşlenmeden üzerine yazılan / istemcinin kaçırdığı kare.", queue="stream")
+        m.counter("frames_encoded_total", yayin.kodlanan, "JPEG'e kodlanan kare.")
+        m.gauge("stream_clients", yayin.izleyici, "Bağlı video izleyicisi.")
+    if kontrol_sureci:
+        m.counter("ring_collisions_total", frame_ring.cakisma, "Okunurken yazılan halka yuvası.")
+        m.histogram("stage_seconds", asama_hist, "SeritTakip aşama süreleri.", "stage")
+        m.histogram("frame_latency_seconds", gecikme_hist,
+                    "Kare yakalamadan olaya geçen süre.", "event")
+
+    if aktuator is not None:
+        m.counter("servo_commands_total", aktuator.uygulanan, "Servoya uygulanan komut.")
+        m.counter("servo_commands_skipped_total", aktuator.atlanan,
+                  "Konum değişmediği için uygulanmayan komut.")
+        m.gauge("servo_command_rate", round(hiz_servo.hiz(now), 2), "Servo komutu/sn (5 sn).")
+
+    if tabela is not None:
+        m.counter("sign_inferences_total", getattr(tabela, "cikarim", None), "Tabela çıkarımı.")
+        m.counter("sign_inferences_skipped_total", getattr(tabela, "atlanan", None),
+                  "Onaylı tabela görüşteyken atlanan çıkarım.")
+        m.gauge("sign_inference_seconds", getattr(tabela, "son_cikarim_s", None),
+                "Son tabela çıkarım süresi.")
+
+    m.gauge("cpu_temperature_celsius", cpu_sicaklik(), "SoC sıcaklığı.")
+    bayrak = kisilma_durumu()
+    if bayrak is not None:
+        m.gauge("throttled_flags", bayrak, "vcgencmd get_throttled bit maskesi.")
+        for bit, ad in KISILMA_BITLERI.items():
+            m.gauge("throttled", (bayrak >> bit) & 1, "Kısılma durumu (bit başına).", reason=ad)
+    return m.metin()
+
+def metrics():
+    """ Prometheus metin biçimi (scrape). """
+    from flask import Response
+
+    return Response(metrikler_metni(), mimetype="text/plain; version=0.0.4")
+
+def api_startup():
+    """ Açılış zaman çizelgesi: {olay: süreç başlangıcından saniye} """
+    from flask import jsonify
+
+    return jsonify(ZAMAN.sozluk())
+
+def web_uygulamasi(komut_fn=komut_uygula):
+    """ komut_fn: PROCESS_MODE web sürecinde komutları ana sürece ileten UzakKomut. """
+    from flask import Flask, jsonify, request
+
+    def api_cmd():
+        """ JSON Body: komut_uygula ile aynı (bkz. yukarı). """
+        data = request.get_json(force=True, silent=True) or {}
+        return jsonify(komut_fn(data))
+
+    web = Flask(__name__)
+    web.add_url_rule("/", view_func=index)
+    web.add_url_rule("/video_feed", view_func=video_feed)
+    web.add_url_rule("/api/cmd", view_func=api_cmd, methods=["POST"])
+    web.add_url_rule("/api/state", view_func=api_state)
+    web.add_url_rule("/viewer", view_func=viewer)
+    web.add_url_rule("/api/startup", view_func=api_startup)
+    web.add_url_rule("/metrics", view_func=metrics)
+    web.add_url_rule("/api/trace", view_func=api_trace)
+    web.add_url_rule("/api/trace/dump", view_func=api_trace_dump, methods=["POST"])
+    return web
+
+def web_thread(komut_fn=komut_uygula):
+    global app
+    app = web_uygulamasi(komut_fn)
+    ZAMAN.isaretle("web_ready")
+    # Flask sunucusu (threaded=True → aynı anda akış + API)
+    app.run(host=HTTP_HOST, port=HTTP_PORT, debug=False, threaded=True, use_reloader=False)
 
 # ================== THREAD BAŞLATMA ==================
+def ikincil_baslat():
+    """ Sürüş için gerekmeyenler: yayın, tabela dedektörü, WebSocket, Flask. """
+    global tabela
+    threads = web_baslat(komut_uygula)
+    if SIGN_ENABLED:
+        tabela = TabelaDedektoru(SIGN_MODEL, stop_event, hz=SIGN_HZ, imgsz=SIGN_IMGSZ,
+                                 threads=SIGN_THREADS,
+                                 onbellek=TespitOnbellegi(n=SIGN_VOTE[0], m=SIGN_VOTE[1]),
+                                 girdi=TabelaGirdisi(SIGN_ROI) if SIGN_ROI else None)
+        tabela.start()
+        threads.append(tabela)
+    return threads
+
+def web_baslat(komut_fn):
+    """ Yayın merkezi + WebSocket + Flask (tek süreçte ya da PROCESS_MODE web sürecinde). """
+    yayin.start()
+    threads = [yayin]
+    if WS_ENABLED:
+        t_ws = WsSunucu(
+            yayin, STATE.sozluk, komut_fn, stop_event,
+            token=WS_TOKEN, host=HTTP_HOST,
+            video_port=WS_VIDEO_PORT, ctrl_port=WS_CTRL_PORT,
+            certfile=os.path.join(BASE_DIR, "certs", "wscert.pem") if WS_TLS else None,
+            keyfile=os.path.join(BASE_DIR, "certs", "wskey.pem") if WS_TLS else None,
+            telemetry_hz=WS_TELEMETRY_HZ)
+        t_ws.start()
+        threads.append(t_ws)
+    t_web = threading.Thread(target=web_thread, args=(komut_fn,), daemon=True)
+    t_web.start()
+    threads.append(t_web)
+    return threads
+
+# ================== ÇOK SÜREÇLİ DÜZEN (PROCESS_MODE) ==================
+def web_sureci(vis_tanim, komut_q, durum_q, surec_stop):
+    """ Web süreci girişi: overlay kareler vis halkasından, durum ana süreçten gelir. """
+    global kontrol_sureci
+    kontrol_sureci = False
+    halka = KareHalkasi.bagla(*vis_tanim)
+    threading.Thread(target=durum_al, args=(STATE, durum_q, stop_event), daemon=True).start()
+    threading.Thread(target=halka_besle, args=(halka, yayin, stop_event), daemon=True).start()
+    threads = web_baslat(UzakKomut(komut_q, STATE))
+    try:
+        surec_stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for t in threads:
+            t.join(timeout=2.0)
+        halka.kapat()
+
+def surecleri_baslat():
+    """
+    Web/yayın ve tabela dedektörünü ayrı süreçlerde başlatır (spawn: thread'li süreçte güvenli).
+    Ana süreçte yayin → HalkaYayini, tabela → UzakTabela olur; işleme döngüsü değişmez.
+    """
+    global yayin, tabela, surec_stop
+    ctx = multiprocessing.get_context("spawn")
+    surec_stop = ctx.Event()
+    shape = (CAPTURE_SIZE[1], CAPTURE_SIZE[0], 3)
+    threads = []
+
+    vis = KareHalkasi(shape, n=3, paylasimli=True)
+    komut_q, durum_q = ctx.Queue(maxsize=16), ctx.Queue(maxsize=4)
+    halkalar.append(vis)
+    surecler.append(ctx.Process(target=web_sureci, name="web", daemon=True,
+                                args=(vis.tanim(), komut_q, durum_q, surec_stop)))
+    for hedef, args in ((durum_yayinla, (STATE, durum_q, stop_event)),
+                        (komut_dinle, (komut_q, komut_uygula, stop_event))):
+        t = threading.Thread(target=hedef, args=args, daemon=True)
+        t.start()
+        threads.append(t)
+
+    uzak_tabela = None
+    if SIGN_ENABLED:
+        ham = KareHalkasi(shape, n=3, paylasimli=True)
+        sonuc_q = ctx.Queue(maxsize=16)
+        halkalar.append(ham)
+        kw = dict(model_path=SIGN_MODEL, hz=SIGN_HZ, imgsz=SIGN_IMGSZ, threads=SIGN_THREADS,
+                  vote=SIGN_VOTE, roi=SIGN_ROI)
+        surecler.append(ctx.Process(target=tabela_sureci, name="tabela", daemon=True,
+                                    args=(ham.tanim(), sonuc_q, surec_stop, kw)))
+        uzak_tabela = UzakTabela(ham, sonuc_q, hz=SIGN_HZ)
+
+    for p in surecler:
+        p.start()
+    yayin = HalkaYayini(vis)
+    tabela = uzak_tabela
+    ZAMAN.isaretle("processes_started")
+    return threads
+
 def start_threads():
-    t_cam = CaptureThread(frame_q, stop_event)
+    """
+    FAST_START: motorlar → UDP komut kanalı → kamera + işleme döngüsü hemen;
+    Flask/yayın/tabela/WebSocket arka plan thread'inde sonradan kurulur.
+    Aksi halde her şey sırayla kurulur, kontrol döngüsü en son başlar.
+    PROCESS_MODE: web/yayın ve tabela thread yerine alt süreçlerde (surecleri_baslat).
+    """
+    donanim_kur()
+    threads = []
+    if UDP_ENABLED:
+        t_udp = KomutKanali(komut_uygula, stop_event, token=UDP_TOKEN, host=HTTP_HOST, port=UDP_PORT)
+        t_udp.start()
+        threads.append(t_udp)
+    if PROCESS_MODE:
+        threads += surecleri_baslat()
+    elif not FAST_START:
+        threads += ikincil_baslat()
+
+    t_cam = CaptureThread(frame_ring, stop_event)
     t_proc = threading.Thread(target=processing_thread, daemon=True)
     t_cam.start()
     t_proc.start()
-    return [t_cam, t_proc]
+    threads += [t_cam, t_proc]
+
+    if FAST_START and not PROCESS_MODE:
+        t_ikincil = threading.Thread(target=lambda: threads.extend(ikincil_baslat()), daemon=True)
+        t_ikincil.start()
+    return threads
 
 # ================== ANA ÇALIŞTIRMA ==================
 def main():
     threads = start_threads()
     try:
-        # Flask sunucusu (threaded=True → aynı anda akış + API)
-        app.run(host=HTTP_HOST, port=HTTP_PORT, debug=False, threaded=True)
+        while not stop_event.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
     finally:
         stop_event.set()
-        for t in threads:
+        if surec_stop is not None:
+            surec_stop.set()
+        for t in list(threads):
             t.join(timeout=2.0)
+        for p in surecler:
+            p.join(timeout=3.0)
+        for h in halkalar:
+            h.kapat()
+        if TRACE_ENABLED and TRACE_DUMP_ON_EXIT:
+            yol, sayi = iz_dok()
+            print(f"Gecikme izi: {yol} ({sayi} kayıt)")
         try:
             cv2.destroyAllWindows()
         except Exception:
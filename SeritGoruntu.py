@@ -3,22 +3,236 @@ import numpy as np
 import math
 import time
 
+def segmentleri_siniflandir(lines, frame_h, frame_w):
+    """
+    HoughLinesP çıktısını ((N,1,4) dizi) tek seferde, vektörel olarak sol/sağ
+    sınıflarına ayırır. Kavislerde yatay parçalara izin vermek için eğim eşiği
+    gevşek (0.2); çok yatay parçalar alt kesişim x konumuna göre ayrılır.
+
+    DÖNÜŞ: (left_mb, right_mb, left_avg, right_avg)
+      left_mb / right_mb: (K,2) [m, b] dizileri; *_avg: ortalama [m, b] ya da None
+    """
+    empty = np.empty((0, 2))
+    if lines is None or len(lines) == 0:
+        return empty, empty, None, None
+
+    seg = lines.reshape(-1, 4).astype(np.float64)
+    x1, y1, x2, y2 = seg[:, 0], seg[:, 1], seg[:, 2], seg[:, 3]
+
+    y_band_top = int(frame_h * 0.60)   # alt %40
+    y_band_bot = frame_h - 1
+    xc = frame_w / 2.0
+
+    dx = x2 - x1
+    dy = y2 - y1
+    # x2 == x1 → çok dik (1e6)
+    m = np.divide(dy, dx, out=np.full_like(dy, 1e6), where=(dx != 0))
+    b = y1 - m * x1
+
+    in_band = np.maximum(y1, y2) >= y_band_top   # tamamen üstteyse alma
+    flat = np.abs(m) < 0.2
+
+    # Çok yataysa alt kesişim konumuna göre sınıflandır
+    has_slope = np.abs(m) > 1e-6
+    x_eval = np.divide(y_band_bot - b, m, out=(x1 + x2) / 2.0, where=has_slope)
+
+    left_sel  = in_band & ((flat & (x_eval <  xc)) | (~flat & (m < -0.2)))
+    right_sel = in_band & ((flat & (x_eval >= xc)) | (~flat & (m >  0.2)))
+
+    mb = np.column_stack((m, b))
+    left_mb, right_mb = mb[left_sel], mb[right_sel]
+    left_avg  = left_mb.mean(axis=0)  if len(left_mb)  else None
+    right_avg = right_mb.mean(axis=0) if len(right_mb) else None
+    return left_mb, right_mb, left_avg, right_avg
+
+
+class DireksiyonPID:
+    """
+    Merkez sapmasından (px) sürekli direksiyon değeri üretir: [-1, 1], −1 tam sol, +1 tam sağ.
+    PID çıkışı max_rate (birim/sn) ile hız sınırlıdır; ani sağ-sol sıçramaları olmaz.
+    Uzun aradan sonraki ilk adım da sınırlıdır (ilk_dt kadar); servo başka yerden
+    sürüldüyse (MANUAL) konum(deger) ile çıkış son komuta eşitlenir.
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, max_rate=4.0, i_limit=0.3, ilk_dt=1/30.0,
+                 bosluk_s=0.5):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.max_rate = max_rate
+        self.i_limit = i_limit
+        self.ilk_dt = ilk_dt
+        self.bosluk_s = bosluk_s     # bundan uzun ara → geçmiş geçersiz, adım ilk_dt ile sınırlı
+        self.output = 0.0
+        self.reset()
+
+    def reset(self):
+        """ Integral/türev geçmişini siler; çıkış (servonun son konumu) korunur. """
+        self.integral = 0.0
+        self.prev_error = None
+        self.prev_t = None
+
+    def konum(self, deger):
+        """ Servoya dışarıdan verilen son komut [-1, 1] (ör. MANUAL); sonraki adım buradan başlar. """
+        self.output = min(max(float(deger), -1.0), 1.0)
+        self.reset()
+
+    def _limit(self, target, now):
+        target = min(max(target, -1.0), 1.0)
+        dt = (now - self.prev_t) if self.prev_t is not None else self.ilk_dt
+        if dt > self.bosluk_s:
+            dt = self.ilk_dt          # step() ve hedef() için ortak: uzun aradan sonra sıçrama yok
+        step = self.max_rate * dt
+        self.output += min(max(target - self.output, -step), step)
+        self.prev_t = now
+        return self.output
+
+    def step(self, error_px, now=None):
+        now = time.monotonic() if now is None else now
+        if self.prev_t is not None and now - self.prev_t > self.bosluk_s:
+            # uzun ara (ör. MANUAL'den dönüş) → eski integral/türev geçersiz
+            self.reset()
+
+        dt = (now - self.prev_t) if self.prev_t is not None else 0.0
+        d = 0.0
+        if dt > 0:
+            self.integral += error_px * dt
+            lim = self.i_limit / self.ki if self.ki else 0.0
+            self.integral = min(max(self.integral, -lim), lim)
+            if self.prev_error is not None:
+                d = (error_px - self.prev_error) / dt
+        self.prev_error = error_px
+
+        return self._limit(self.kp * error_px + self.ki * self.integral + self.kd * d, now)
+
+    def hedef(self, value, now=None):
+        """ PID'siz sabit hedef (recovery); yine hız sınırlı. """
+        now = time.monotonic() if now is None else now
+        self.prev_error = None
+        self.integral = 0.0
+        return self._limit(value, now)
+
+
+class KareOnIsleme:
+    """
+    Tek bir karenin ön işleme sonuçlarını (HSV maske, bulanık maske, ikili görüntü,
+    ROI'ye kırpılmış kenarlar) ilk istendiğinde bir kez hesaplar ve saklar.
+    get_lines ve detect_lanes_poly aynı nesneyi alırsa renk dönüşümü tekrar yapılmaz.
+
+    serit.roi_crop açıksa tüm işlemler karenin yalnız alt dilimi (numpy view) üzerinde
+    yapılır; y0 bu dilimin tam karedeki başlangıç satırıdır.
+    """
+
+    def __init__(self, frame, serit):
+        self.frame = frame
+        self.serit = serit
+        self.h, self.w = frame.shape[:2]
+
+        if serit.roi_crop:
+            self.y0 = serit.roi_top(self.h)
+            self.src = frame[self.y0:, :]   # kopya değil, view
+        else:
+            self.y0 = 0
+            self.src = frame
+
+        self._mask = None
+        self._blurred = None
+        self._binary = None
+        self._edges = None
+
+    @property
+    def mask(self):
+        if self._mask is None:
+            olc = self.serit._olc
+            t = time.perf_counter()
+            hsv = cv2.cvtColor(self.src, cv2.COLOR_BGR2HSV)
+            t = olc("hsv", t)
+            self._mask = cv2.inRange(hsv, self.serit.lower_white, self.serit.upper_white)
+            olc("inrange", t)
+        return self._mask
+
+    @property
+    def blurred(self):
+        if self._blurred is None:
+            mask = self.mask
+            t = time.perf_counter()
+            self._blurred = cv2.GaussianBlur(mask, (5, 5), 0)
+            self.serit._olc("blur", t)
+        return self._blurred
+
+    @property
+    def binary(self):
+        if self._binary is None:
+            blurred = self.blurred
+            t = time.perf_counter()
+            _, self._binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY)
+            self.serit._olc("threshold", t)
+        return self._binary
+
+    @property
+    def edges(self):
+        """ Canny + hafif dilate + ROI (Hough girişi) """
+        if self._edges is None:
+            olc = self.serit._olc
+            blurred = self.blurred
+            # kavisli yerlerde kesik kenarları birleştirmek için hafif dilate
+            kernel = np.ones((3,3), np.uint8)
+            t = time.perf_counter()
+            edges = cv2.Canny(blurred, 50, 150)
+            t = olc("canny", t)
+            edges = cv2.dilate(edges, kernel, iterations=1)
+            t = olc("dilate", t)
+            # kırpılmış modda görüntü zaten ROI'nin kendisi
+            self._edges = edges if self.y0 else self.serit.region_of_interest(edges)
+            olc("roi", t)
+        return self._edges
+
+
 class SeritTakip:
     """
+    - on_isle(frame): Kare başına ortak ön işleme (KareOnIsleme); iki dedektör de bunu kabul eder.
     - get_lines(frame): HoughLinesP ile doğrusal parçalar (kavis için güçlendirildi).
     - detect_lanes_poly(frame): Sliding-window + 2. derece polinom (kavislerde sağlam).
     - get_steering_decision(...): Her durumda 'Sag' / 'Sol' / 'Duz git' üretir.
       Kısmi şeritlerde sanal şerit tamamlama, tamamen kayıpta recovery (en son görülen tarafa arama).
+    - get_steering_value(karar): Aynı ölçümden sürekli direksiyon değeri [-1, 1] (PID + hız sınırı).
     """
 
     def __init__(self,
                  lane_width_px=300,         # sanal şerit için tahmini piksel genişliği
                  center_deadband_px=40,     # merkeze yakınsa 'Duz git' bandı
-                 kp_center=0.007):
+                 kp_center=0.007,
+                 roi_top_ratio=0.5,         # ROI üst sınırı (kare yüksekliğine oran)
+                 roi_crop=False,            # True → yalnız alt dilim işlenir (yarı piksel)
+                 poly_tracking=True):       # True → önceki polinom etrafında bant araması
 
         self.lane_width_px = lane_width_px
         self.center_deadband_px = center_deadband_px
         self.kp_center = kp_center
+        self.pid = DireksiyonPID(kp=kp_center)
+        self.roi_top_ratio = roi_top_ratio
+        self.roi_crop = roi_crop
+
+        # (shape, dtype, roi_top) → hazır ROI maskesi
+        self._roi_mask_cache = {}
+
+        # Polinom takibi (detect_lanes_poly)
+        self.poly_tracking = poly_tracking
+        self.poly_margin = 50        # bant yarı genişliği (px)
+        self.poly_minfit = 200       # fit için en az piksel
+        self.poly_maxfit = 1500      # fit'e en fazla bu kadar piksel (fazlası seyreltilir)
+        self.poly_max_age_s = 0.5    # daha eski fit ile takip yapılmaz
+        self.left_fit = None
+        self.right_fit = None
+        self._fit_shape = None
+        self._fit_time = 0.0
+
+        # Aşama süreleri için isteğe bağlı olcum.AsamaProfil (None → kapalı)
+        self.profil = None
+
+        # Son Hough sınıflandırması (karar ve overlay aynı sonucu kullanır)
+        self._son_lines = None
+        self._son_siniflandirma = None
 
         # Recovery durumu
         self.last_seen = None      # "LEFT" | "RIGHT" | "BOTH" | None
@@ -32,90 +246,85 @@ class SeritTakip:
         self.db_have_left = False
         self.db_have_right = False
         self.db_delta_px = 0
+        self.db_delta_ok = False   # bu karede merkez sapması ölçülebildi mi
+
+    def _olc(self, ad, t0):
+        """ Profil açıksa t0'dan beri geçen süreyi 'ad' aşamasına yazar; yeni t0 döner. """
+        t = time.perf_counter()
+        if self.profil is not None:
+            self.profil.ekle(ad, t - t0)
+        return t
 
     # ---------- Görüntü ön işleme ----------
+    def roi_top(self, h):
+        return int(h * self.roi_top_ratio)  # alt yarıya daha çok odaklan
+
     def region_of_interest(self, img):
         h, w = img.shape[:2]
-        mask = np.zeros_like(img)
-        roi_top = int(h * 0.5)  # alt yarıya daha çok odaklan
-        polygon = np.array([[
-            (0, h),
-            (w, h),
-            (w, roi_top),
-            (0, roi_top)
-        ]], np.int32)
-        cv2.fillPoly(mask, polygon, 255)
+        roi_top = self.roi_top(h)
+        key = (img.shape, img.dtype.str, roi_top)
+        mask = self._roi_mask_cache.get(key)
+        if mask is None:
+            # maske sabit bir dikdörtgen; kare boyutu değişmedikçe bir kez üretilir
+            mask = np.zeros_like(img)
+            polygon = np.array([[
+                (0, h),
+                (w, h),
+                (w, roi_top),
+                (0, roi_top)
+            ]], np.int32)
+            cv2.fillPoly(mask, polygon, 255)
+            self._roi_mask_cache[key] = mask
         masked_img = cv2.bitwise_and(img, mask)
         return masked_img
 
+    def on_isle(self, frame):
+        """ Kare için ön işleme nesnesi; zaten KareOnIsleme ise aynen döner. """
+        if isinstance(frame, KareOnIsleme):
+            return frame
+        return KareOnIsleme(frame, self)
+
     # ---------- Hough tabanlı çizgi çıkarımı (kavis için güçlendirilmiş) ----------
     def get_lines(self, frame):
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, self.lower_white, self.upper_white)
-        blurred = cv2.GaussianBlur(mask, (5, 5), 0)
-
-        # kavisli yerlerde kesik kenarları birleştirmek için hafif dilate
-        kernel = np.ones((3,3), np.uint8)
-        edges = cv2.Canny(blurred, 50, 150)
-        edges = cv2.dilate(edges, kernel, iterations=1)
-
-        cropped = self.region_of_interest(edges)
+        pre = self.on_isle(frame)
+        edges = pre.edges
+        t = time.perf_counter()
         lines = cv2.HoughLinesP(
-            cropped, 1, np.pi/180,
+            edges, 1, np.pi/180,
             threshold=40,        # 50 -> 40
             minLineLength=25,    # 40 -> 25 (kısa parçaları yakala)
             maxLineGap=150       # 100 -> 150 (parçaları bağla)
         )
+        if lines is not None and pre.y0:
+            # kırpılmış dilim koordinatlarını tam kareye taşı
+            lines[:, :, 1] += pre.y0
+            lines[:, :, 3] += pre.y0
+        self._olc("hough", t)
         return lines
 
     # ---------- Yardımcılar (Hough için) ----------
+    def siniflandir(self, lines, frame_h, frame_w):
+        """
+        segmentleri_siniflandir sonucunu son kare için saklar; aynı lines dizisi
+        için (karar + overlay) hesap tekrar yapılmaz.
+        """
+        key = (frame_h, frame_w)
+        if lines is not self._son_lines or self._son_siniflandirma is None \
+                or self._son_siniflandirma[0] != key:
+            self._son_lines = lines
+            self._son_siniflandirma = (key, segmentleri_siniflandir(lines, frame_h, frame_w))
+        return self._son_siniflandirma[1]
+
     def _fit_avg_lr(self, lines, frame_h, frame_w):
         """
         Hough segmentlerinden sol/sağ için (slope, intercept) ortalaması çıkar.
-        Kavislerde yatay parçalara izin vermek için eğim eşiği gevşetildi,
-        alt banda ve alt kesişim x konumuna bakıyoruz.
+        Sınıflandırma vektörel (segmentleri_siniflandir).
         """
         if lines is None:
             return False, False, None, None
 
-        left, right = [], []
-        y_band_top = int(frame_h * 0.60)   # alt %40
-        y_band_bot = frame_h - 1
-        xc = frame_w / 2.0
-
-        for l in lines:
-            x1, y1, x2, y2 = l[0]
-            if max(y1, y2) < y_band_top:   # tamamen üstteyse alma
-                continue
-
-            if x2 == x1:
-                m = 1e6  # çok dik
-            else:
-                m = (y2 - y1) / (x2 - x1)
-            b = y1 - m * x1
-
-            # Eğim eşiği gevşetildi (0.2). Çok yataysa alt kesişim konumuna göre sınıflandır.
-            if abs(m) < 0.2:
-                y_eval = y_band_bot
-                if abs(m) > 1e-6:
-                    x_eval = (y_eval - b) / m
-                else:
-                    x_eval = (x1 + x2) / 2.0
-                if x_eval < xc:
-                    left.append((m, b))
-                else:
-                    right.append((m, b))
-            else:
-                if m < -0.2:
-                    left.append((m, b))
-                elif m > 0.2:
-                    right.append((m, b))
-
-        have_left  = len(left)  > 0
-        have_right = len(right) > 0
-        left_avg  = np.average(left,  axis=0) if have_left  else None
-        right_avg = np.average(right, axis=0) if have_right else None
-        return have_left, have_right, left_avg, right_avg
+        _, _, left_avg, right_avg = self.siniflandir(lines, frame_h, frame_w)
+        return left_avg is not None, right_avg is not None, left_avg, right_avg
 
     @staticmethod
     def _x_at_y(mb, y):
@@ -128,72 +337,130 @@ class SeritTakip:
         return (y - b) / m
 
     # ---------- Polinom (sliding window) tabanlı algılama ----------
+    def _polyfit(self, ys, xs):
+        """ 2. derece fit; poly_maxfit'ten çok piksel varsa eşit adımla seyreltilir. """
+        adim = -(-len(ys) // self.poly_maxfit)
+        return np.polyfit(ys[::adim], xs[::adim], 2)
+
+    def _band_fit(self, fit, nonzerox, nonzeroy, h):
+        """
+        Önceki polinomun ±poly_margin bandındaki piksellerle yeniden fit; yetersizse None.
+        Yalnız ROI üst sınırının altındaki satırlara bakılır (nonzeroy sıralı → tek dilim);
+        polinom piksel başına değil satır başına bir kez hesaplanır. Çok piksel varsa bant
+        testi de seyreltilmiş noktalarla yapılır (adım, en az piksel sayımında geri çarpılır).
+        """
+        lo = np.searchsorted(nonzeroy, self.roi_top(h))
+        adim = max(1, (len(nonzeroy) - lo) // (4 * self.poly_maxfit))
+        ys, xs = nonzeroy[lo::adim], nonzerox[lo::adim]
+        x_pred = np.polyval(fit, np.arange(h, dtype=np.float64))[ys]
+        inds = (np.abs(xs - x_pred) < self.poly_margin).nonzero()[0]
+        if len(inds) * adim <= self.poly_minfit:
+            return None
+        return self._polyfit(ys[inds], xs[inds])
+
     def detect_lanes_poly(self, frame):
-        h, w = frame.shape[:2]
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, self.lower_white, self.upper_white)
-        blurred = cv2.GaussianBlur(mask, (5,5), 0)
+        """
+        Takip modu (poly_tracking): önceki karenin left_fit/right_fit'i varsa yalnız
+        onun etrafındaki bantta arar. Histogram + sliding window yalnız o taraf
+        kaybolduğunda (ya da fit eskidiyse) çalışır. Pencereler, satıra göre sıralı
+        nonzero dizisinde searchsorted ile kendi satır dilimine bakar.
+        """
+        pre = self.on_isle(frame)
+        h, w = pre.h, pre.w
 
         # ikili görüntü
-        _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY)
-
-        # alt yarı histogram
-        bottom = binary[int(h*0.6):, :]
-        histogram = np.sum(bottom, axis=0)
-
-        midpoint = w // 2
-        leftx_base  = np.argmax(histogram[:midpoint]) if histogram[:midpoint].any() else None
-        rightx_base = np.argmax(histogram[midpoint:]) + midpoint if histogram[midpoint:].any() else None
-
-        if leftx_base is None and rightx_base is None:
-            return None  # tamamen yok
-
-        # sliding window parametreleri
-        nwindows = 9
-        window_height = h // nwindows
-        nonzero = binary.nonzero()
-        nonzeroy = np.array(nonzero[0])
-        nonzerox = np.array(nonzero[1])
-
-        margin = 50
-        minpix = 30
-
-        leftx_current = leftx_base
-        rightx_current = rightx_base
-
-        left_lane_inds = []
-        right_lane_inds = []
-
-        for window in range(nwindows):
-            win_y_low  = h - (window + 1) * window_height
-            win_y_high = h - window * window_height
-
-            if leftx_current is not None:
-                win_xleft_low  = leftx_current - margin
-                win_xleft_high = leftx_current + margin
-                good_left_inds = ((nonzeroy >= win_y_low) & (nonzeroy < win_y_high) &
-                                  (nonzerox >= win_xleft_low) & (nonzerox < win_xleft_high)).nonzero()[0]
-                left_lane_inds.append(good_left_inds)
-                if len(good_left_inds) > minpix:
-                    leftx_current = int(np.mean(nonzerox[good_left_inds]))
-
-            if rightx_current is not None:
-                win_xright_low  = rightx_current - margin
-                win_xright_high = rightx_current + margin
-                good_right_inds = ((nonzeroy >= win_y_low) & (nonzeroy < win_y_high) &
-                                   (nonzerox >= win_xright_low) & (nonzerox < win_xright_high)).nonzero()[0]
-                right_lane_inds.append(good_right_inds)
-                if len(good_right_inds) > minpix:
-                    rightx_current = int(np.mean(nonzerox[good_right_inds]))
-
-        left_lane_inds  = np.concatenate(left_lane_inds)  if len(left_lane_inds)  else np.array([], dtype=int)
-        right_lane_inds = np.concatenate(right_lane_inds) if len(right_lane_inds) else np.array([], dtype=int)
-
-        leftx, lefty   = nonzerox[left_lane_inds],  nonzeroy[left_lane_inds]
-        rightx, righty = nonzerox[right_lane_inds], nonzeroy[right_lane_inds]
-
-        left_fit  = np.polyfit(lefty,  leftx,  2) if len(leftx)  > 200 else None
-        right_fit = np.polyfit(righty, rightx, 2) if len(rightx) > 200 else None
+        binary = pre.binary
+
+        # findNonZero satır-öncelikli döner → nonzeroy artan sırada (satır kovaları için)
+        t = time.perf_counter()
+        noktalar = cv2.findNonZero(binary)
+        noktalar = np.empty((0, 2), np.int32) if noktalar is None else noktalar.reshape(-1, 2)
+        nonzerox = noktalar[:, 0]
+        nonzeroy = noktalar[:, 1] + pre.y0
+        t = self._olc("nonzero", t)
+
+        # ---- takip: önceki fit etrafında bant araması ----
+        prev_left, prev_right = self.left_fit, self.right_fit
+        if (not self.poly_tracking or self._fit_shape != (h, w)
+                or time.time() - self._fit_time > self.poly_max_age_s):
+            prev_left = prev_right = None
+
+        left_fit  = self._band_fit(prev_left,  nonzerox, nonzeroy, h) if prev_left  is not None else None
+        right_fit = self._band_fit(prev_right, nonzerox, nonzeroy, h) if prev_right is not None else None
+        t = self._olc("track", t)
+
+        search_left  = left_fit  is None
+        search_right = right_fit is None
+
+        if search_left or search_right:
+            # alt yarı histogram (binary kırpılmışsa satırlar y0 kadar kaymıştır)
+            bottom = binary[max(int(h*0.6) - pre.y0, 0):, :]
+            histogram = np.sum(bottom, axis=0)
+
+            midpoint = w // 2
+            leftx_base = rightx_base = None
+            if search_left and histogram[:midpoint].any():
+                leftx_base = np.argmax(histogram[:midpoint])
+            if search_right and histogram[midpoint:].any():
+                rightx_base = np.argmax(histogram[midpoint:]) + midpoint
+            t = self._olc("histogram", t)
+
+            if leftx_base is None and rightx_base is None and left_fit is None and right_fit is None:
+                self.left_fit = self.right_fit = None
+                return None  # tamamen yok
+
+            # sliding window parametreleri
+            nwindows = 9
+            window_height = h // nwindows
+            margin = 50
+            minpix = 30
+
+            # her pencerenin satır aralığı → nonzero dizisindeki [lo, hi) dilimi
+            y_edges = h - np.arange(nwindows + 1) * window_height
+            row_idx = np.searchsorted(nonzeroy, y_edges)
+
+            leftx_current = leftx_base
+            rightx_current = rightx_base
+
+            left_lane_inds = []
+            right_lane_inds = []
+
+            for window in range(nwindows):
+                lo, hi = row_idx[window + 1], row_idx[window]
+                if lo == hi:
+                    continue
+                xs = nonzerox[lo:hi]
+
+                if leftx_current is not None:
+                    good_left_inds = ((xs >= leftx_current - margin) &
+                                      (xs <  leftx_current + margin)).nonzero()[0] + lo
+                    left_lane_inds.append(good_left_inds)
+                    if len(good_left_inds) > minpix:
+                        leftx_current = int(np.mean(nonzerox[good_left_inds]))
+
+                if rightx_current is not None:
+                    good_right_inds = ((xs >= rightx_current - margin) &
+                                       (xs <  rightx_current + margin)).nonzero()[0] + lo
+                    right_lane_inds.append(good_right_inds)
+                    if len(good_right_inds) > minpix:
+                        rightx_current = int(np.mean(nonzerox[good_right_inds]))
+            t = self._olc("windows", t)
+
+            if left_lane_inds:
+                left_lane_inds = np.concatenate(left_lane_inds)
+                if len(left_lane_inds) > self.poly_minfit:
+                    left_fit = self._polyfit(nonzeroy[left_lane_inds], nonzerox[left_lane_inds])
+
+            if right_lane_inds:
+                right_lane_inds = np.concatenate(right_lane_inds)
+                if len(right_lane_inds) > self.poly_minfit:
+                    right_fit = self._polyfit(nonzeroy[right_lane_inds], nonzerox[right_lane_inds])
+            self._olc("polyfit", t)
+
+        # takip için sakla (kaybolan taraf None → sonraki karede histogramla aranır)
+        self.left_fit, self.right_fit = left_fit, right_fit
+        self._fit_shape = (h, w)
+        self._fit_time = time.time()
 
         return left_fit, right_fit, (h, w)
 
@@ -224,6 +491,7 @@ class SeritTakip:
         frame_center = w/2.0
         delta = lane_center - frame_center
         self.db_delta_px = int(delta)
+        self.db_delta_ok = True
         self.db_have_left = have_left
         self.db_have_right = have_right
 
@@ -245,6 +513,7 @@ class SeritTakip:
         self.db_have_left = bool(have_left)
         self.db_have_right = bool(have_right)
         self.db_delta_px = 0
+        self.db_delta_ok = False
 
         # Durum kaydı (recovery için)
         if have_left and have_right:
@@ -267,6 +536,7 @@ class SeritTakip:
             frame_center = frame_width / 2.0
             delta = lane_center - frame_center
             self.db_delta_px = int(delta)
+            self.db_delta_ok = True
 
             if   delta < -self.center_deadband_px: return "Sol"
             elif delta >  self.center_deadband_px: return "Sag"
@@ -282,6 +552,7 @@ class SeritTakip:
             frame_center = frame_width / 2.0
             delta = lane_center - frame_center
             self.db_delta_px = int(delta)
+            self.db_delta_ok = True
 
             if   delta < -self.center_deadband_px: return "Sol"
             elif delta >  self.center_deadband_px: return "Sag"
@@ -297,6 +568,7 @@ class SeritTakip:
             frame_center = frame_width / 2.0
             delta = lane_center - frame_center
             self.db_delta_px = int(delta)
+            self.db_delta_ok = True
 
             if   delta < -self.center_deadband_px: return "Sol"
             elif delta >  self.center_deadband_px: return "Sag"
@@ -309,3 +581,32 @@ class SeritTakip:
             return "Sol"
         else:
             return "Duz git"
+
+    def karar_ver(self, frame):
+        """
+        Tek kare için tam karar akışı: Hough kararı, zayıf kalırsa polinom desteği.
+        frame: ham kare ya da KareOnIsleme (Main ve replay aynı akışı kullanır).
+        DÖNÜŞ: (karar, lines)
+        """
+        pre = self.on_isle(frame)
+        lines = self.get_lines(pre)
+        karar = self.get_steering_decision(lines, pre.w, pre.h)
+        if (lines is None or len(lines) < 4) and karar == "Duz git":
+            poly_out = self.detect_lanes_poly(pre)
+            karar = self.decision_from_poly(poly_out)
+        return karar, lines
+
+    # ---------- Sürekli direksiyon ----------
+    def get_steering_value(self, karar, now=None):
+        """
+        DÖNÜŞ: [-1, 1] (−1 tam sol, +1 tam sağ).
+        Karar fonksiyonları bu karede sapma ölçtüyse (db_delta_ok) PID ile,
+        ölçemediyse (recovery) kararın yönüne tam kilit hedeflenir.
+        """
+        if self.db_delta_ok:
+            return self.pid.step(self.db_delta_px, now)
+        if karar == "Sag":
+            return self.pid.hedef(1.0, now)
+        if karar == "Sol":
+            return self.pid.hedef(-1.0, now)
+        return self.pid.hedef(0.0, now)
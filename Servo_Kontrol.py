@@ -1,12 +1,16 @@
 import RPi.GPIO as GPIO
 import time
 
+from direksiyon import gorev_dongusu_hesapla
+
 class ServoKontrol:
     """
     Tek bir pinden sinyal alarak çalışan direksiyon servo motoru kontrol sınıfı.
     """
     # Sadece tek bir pin parametresi kullanılıyor.
-    def __init__(self, pin_servo=17):
+    # baslangic_bekle: servonun merkeze oturması için bekleme; DireksiyonAktuator kullanılıyorsa
+    # 0 verilebilir (ilk komut zaten yerleşme süresiyle uygulanır, açılış bloklanmaz).
+    def __init__(self, pin_servo=17, baslangic_bekle=0.5):
         # pin_servo artık direksiyon kontrol pini
         self.pin_direksiyon = pin_servo 
         
@@ -18,6 +22,8 @@ class ServoKontrol:
 
         self.servo_frekans = 50       # Servo frekansı 50 Hz
         self.merkez_gorev_dongusu = 5.0 # %7.5 Duty Cycle = Merkez (Düz) konum
+        self.sag_gorev_dongusu = 6.5    # Sağ için Duty Cycle
+        self.sol_gorev_dongusu = 3.0    # Sol için Duty Cycle
 
         # Orijinal koddaki pwm_sag adını koruyoruz, ancak bu artık tek servoyu kontrol eder.
         self.pwm_sag = GPIO.PWM(self.pin_direksiyon, self.servo_frekans)
@@ -25,25 +31,24 @@ class ServoKontrol:
         # Servoyu merkez pozisyonda başlat.
         self.pwm_sag.start(self.merkez_gorev_dongusu)
         print(f"Direksiyon Servosu (BCM {self.pin_direksiyon}) merkezde başlatıldı.")
-        time.sleep(0.5) 
+        if baslangic_bekle > 0:
+            time.sleep(baslangic_bekle)
 
 
     def saga_don(self):
         """Direksiyonu sağa çevirir ve sonra merkeze alır."""
-        sag_gorev_dongusu = 6.5 #Sağ için Duty Cycle (%5)
         print("Sağa dön komutu (Direksiyon sağa çevriliyor)")
         
-        self.pwm_sag.ChangeDutyCycle(sag_gorev_dongusu)
+        self.pwm_sag.ChangeDutyCycle(self.sag_gorev_dongusu)
         time.sleep(0.3)
         #self.dur() # Merkeze geri dön (direksiyonu düzle)
 
 
     def sola_don(self):
         """Direksiyonu sola çevirir ve sonra merkeze alır."""
-        sol_gorev_dongusu = 3.0# Sol için Duty Cycle (%10)
         print("Sola dön komutu (Direksiyon sola çevriliyor)")
         
-        self.pwm_sag.ChangeDutyCycle(sol_gorev_dongusu)
+        self.pwm_sag.ChangeDutyCycle(self.sol_gorev_dongusu)
         time.sleep(0.3)
         #self.dur() # Merkeze geri dön (direksiyonu düzle)
 
@@ -54,6 +59,14 @@ class ServoKontrol:
         self.pwm_sag.ChangeDutyCycle(self.merkez_gorev_dongusu)
         time.sleep(0.3)
         
+    def gorev_dongusu_ayarla(self, gorev_dongusu):
+        """Duty cycle'ı beklemeden uygular (DireksiyonAktuator kullanır)."""
+        self.pwm_sag.ChangeDutyCycle(gorev_dongusu)
+
+    def set_angle(self, deger):
+        """Sürekli direksiyon: deger [-1, 1] (−1 tam sol, 0 merkez, +1 tam sağ), beklemeden."""
+        self.pwm_sag.ChangeDutyCycle(gorev_dongusu_hesapla(self, deger))
+
     def dur(self):
         """Direksiyon pozisyonunu merkezde sabitler."""
         self.pwm_sag.ChangeDutyCycle(self.merkez_gorev_dongusu)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Şerit tespiti kıyaslama: SeritTakip aşamalarının (HSV, inRange, blur, Canny, dilate, ROI,
+HoughLinesP / nonzero, histogram, pencereler, polyfit ...) süre dağılımı.
+
+Sabit kare seti (depodaki test görüntüleri + üretilmiş sentetik yol kareleri) birkaç
+çözünürlükte çalıştırılır; her aşama için p50/p95/p99 ve uçtan uca FPS raporlanır.
+--json ile makine-okunur çıktı yazılır, --compare ile önceki bir çıktıyla karşılaştırılır.
+
+Örnek:
+    python bench_serit.py --json bench_yeni.json
+    python bench_serit.py --sizes 640x480 --iters 300 --compare bench_eski.json
+    python bench_serit.py --sizes 640x480 --repeat 10 --no-tracking   # takip kazancı için
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+
+import cv2
+import numpy as np
+
+from SeritGoruntu import SeritTakip
+from olcum import AsamaProfil
+
+DEPO = os.path.dirname(os.path.abspath(__file__))
+DEPO_GORUNTULERI = ("test.jpg", "test_picamera2.jpg")
+AGIRLIK_SIRASI = ("hsv", "inrange", "blur", "canny", "dilate", "roi", "hough",
+                  "threshold", "nonzero", "track", "histogram", "windows", "polyfit", "total")
+
+
+# ================== KARE SETİ ==================
+def sentetik_yol(w, h, egim=0.0, sol=True, sag=True):
+    """ Koyu yol üzerinde beyaz şeritler; egim > 0 sağa, < 0 sola kavis. """
+    frame = np.full((h, w, 3), 55, np.uint8)
+    kalin = max(2, w // 80)
+    ys = np.linspace(h * 0.45, h - 1, 24)
+    t = (ys - h * 0.45) / (h * 0.55)           # 0 (ufuk) → 1 (alt)
+    kayma = egim * w * (1.0 - t) ** 2           # ufka doğru kavis
+    for taraf, x_alt, x_ust in ((sol, 0.12, 0.42), (sag, 0.88, 0.58)):
+        if not taraf:
+            continue
+        xs = w * (x_ust + (x_alt - x_ust) * t) + kayma
+        pts = np.column_stack((xs, ys)).astype(np.int32)
+        cv2.polylines(frame, [pts], False, (245, 245, 245), kalin)
+    return frame
+
+
+def kare_seti(w, h):
+    kareler = []
+    for ad in DEPO_GORUNTULERI:
+        img = cv2.imread(os.path.join(DEPO, ad))
+        if img is not None:
+            kareler.append((ad, cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)))
+    kareler += [
+        ("syn_duz", sentetik_yol(w, h)),
+        ("syn_sag_kavis", sentetik_yol(w, h, egim=0.25)),
+        ("syn_sol_kavis", sentetik_yol(w, h, egim=-0.25)),
+        ("syn_yalniz_sol", sentetik_yol(w, h, sag=False)),
+        ("syn_bos", np.full((h, w, 3), 55, np.uint8)),
+    ]
+    return kareler
+
+
+# ================== ÖLÇÜM ==================
+def yuzdelik(degerler):
+    a = np.asarray(degerler, dtype=np.float64) * 1000.0
+    return {
+        "mean_ms": round(float(a.mean()), 4),
+        "p50_ms": round(float(np.percentile(a, 50)), 4),
+        "p95_ms": round(float(np.percentile(a, 95)), 4),
+        "p99_ms": round(float(np.percentile(a, 99)), 4),
+    }
+
+
+def cozunurluk_olc(w, h, iters, warmup, roi_crop, tracking, repeat=1):
+    kareler = kare_seti(w, h)
+    serit = SeritTakip(lane_width_px=int(w * 300 / 640), center_deadband_px=40,
+                       roi_crop=roi_crop, poly_tracking=tracking)
+    profil = AsamaProfil()
+
+    # 1) Aşama dağılımı: her karede iki dedektör de tam çalışır
+    asamalar = {}
+    for i in range(warmup + iters):
+        _, frame = kareler[(i // repeat) % len(kareler)]
+        serit.profil = profil if i >= warmup else None
+        profil.basla()
+        pre = serit.on_isle(frame)
+        lines = serit.get_lines(pre)
+        serit.get_steering_decision(lines, w, h)
+        serit.detect_lanes_poly(pre)
+        sureler = profil.bitir()
+        if i >= warmup:
+            for ad, sn in sureler.items():
+                asamalar.setdefault(ad, []).append(sn)
+
+    # 2) Uçtan uca: Main'in gerçek karar akışı (polinom yalnız gerektiğinde)
+    serit.profil = None
+    karar_sureleri = []
+    for i in range(warmup + iters):
+        _, frame = kareler[(i // repeat) % len(kareler)]
+        t0 = time.perf_counter()
+        serit.karar_ver(frame)
+        if i >= warmup:
+            karar_sureleri.append(time.perf_counter() - t0)
+
+    sira = [a for a in AGIRLIK_SIRASI if a in asamalar] + sorted(set(asamalar) - set(AGIRLIK_SIRASI))
+    full = np.mean(asamalar["total"])
+    karar = np.mean(karar_sureleri)
+    return {
+        "frames": [ad for ad, _ in kareler],
+        "stages": {ad: yuzdelik(asamalar[ad]) for ad in sira},
+        # aşama, her karede çalışmadıysa (ör. takip varken histogram) sayı < iters olur
+        "stage_counts": {ad: len(asamalar[ad]) for ad in sira},
+        "karar_ver": yuzdelik(karar_sureleri),
+        "fps_full": round(1.0 / full, 1) if full > 0 else None,
+        "fps_karar": round(1.0 / karar, 1) if karar > 0 else None,
+    }
+
+
+def meta_bilgisi(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=DEPO,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "cv2_threads": cv2.getNumThreads(),
+        "iters": args.iters,
+        "warmup": args.warmup,
+        "roi_crop": not args.no_roi_crop,
+        "poly_tracking": not args.no_tracking,
+        "repeat": args.repeat,
+    }
+
+
+# ================== RAPOR ==================
+def yazdir(sonuc, eski=None):
+    for boyut, r in sonuc["results"].items():
+        e = (eski or {}).get("results", {}).get(boyut)
+        print(f"\n== {boyut}  fps_full={r['fps_full']}  fps_karar={r['fps_karar']}"
+              + (f"  (önce: {e['fps_full']} / {e['fps_karar']})" if e else ""))
+        print(f"  {'aşama':<10} {'p50':>9} {'p95':>9} {'p99':>9}" + ("   Δp50" if e else ""))
+        for ad, st in list(r["stages"].items()) + [("karar_ver", r["karar_ver"])]:
+            satir = f"  {ad:<10} {st['p50_ms']:9.3f} {st['p95_ms']:9.3f} {st['p99_ms']:9.3f}"
+            onceki = None
+            if e:
+                onceki = e["karar_ver"] if ad == "karar_ver" else e["stages"].get(ad)
+            if onceki and onceki["p50_ms"] > 0:
+                satir += f"  {100.0 * (st['p50_ms'] - onceki['p50_ms']) / onceki['p50_ms']:+6.1f}%"
+            print(satir)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SeritTakip aşama kıyaslaması")
+    ap.add_argument("--sizes", nargs="+", default=["320x240", "640x480", "1280x720"],
+                    help="WxH çözünürlükler")
+    ap.add_argument("--iters", type=int, default=200, help="çözünürlük başına ölçülen kare")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--no-roi-crop", action="store_true", help="alt dilim kırpmasını kapat")
+    ap.add_argument("--no-tracking", action="store_true", help="polinom takibini kapat")
+    ap.add_argument("--repeat", type=int, default=1,
+                    help="her kare art arda kaç kez (takip yalnız tekrarda devreye girer)")
+    ap.add_argument("--json", help="sonucu JSON dosyasına yaz")
+    ap.add_argument("--compare", help="önceki JSON çıktısı ile karşılaştır")
+    args = ap.parse_args()
+
+    sonuc = {"meta": meta_bilgisi(args), "results": {}}
+    for boyut in args.sizes:
+        w, h = (int(v) for v in boyut.lower().split("x"))
+        sonuc["results"][boyut] = cozunurluk_olc(w, h, args.iters, args.warmup,
+                                                 roi_crop=not args.no_roi_crop,
+                                                 tracking=not args.no_tracking,
+                                                 repeat=max(1, args.repeat))
+
+    eski = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            eski = json.load(f)
+    yazdir(sonuc, eski)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(sonuc, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
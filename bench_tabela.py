@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabela dedektörü arka uç kıyaslaması: aynı kare seti üzerinde PyTorch (.pt, ultralytics)
+ve model_aktar.py ile üretilen ONNX (fp32/fp16/int8) modelleri yan yana ölçülür.
+
+Her model için: yükleme süresi, ilk çıkarım, çıkarım p50/p95/p99, FPS ve ilk modele göre
+etiket uyumu (aynı karede aynı etiket kümesi oranı) raporlanır.
+
+Örnek:
+    python bench_tabela.py weights/best.pt weights/best_320_int8.onnx --imgsz 320
+    python bench_tabela.py weights/best.pt weights/best_320_fp16.onnx --no-roi --json tabela.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+from bench_serit import DEPO, DEPO_GORUNTULERI, yuzdelik
+from tabela import TabelaGirdisi, arka_uc_kur
+
+
+def kare_seti(w, h, roi):
+    kareler = []
+    for ad in DEPO_GORUNTULERI:
+        img = cv2.imread(os.path.join(DEPO, ad))
+        if img is not None:
+            kareler.append((ad, cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)))
+    kareler.append(("bos", np.full((h, w, 3), 55, np.uint8)))
+    if roi:
+        girdi = TabelaGirdisi(roi, tampon=1)
+        kareler = [(ad, girdi.kes(f).copy()) for ad, f in kareler]
+    return kareler
+
+
+def model_olc(yol, kareler, imgsz, conf, threads, iters, warmup):
+    t0 = time.perf_counter()
+    arka_uc = arka_uc_kur(yol, imgsz=imgsz, conf=conf, threads=threads)
+    yukleme = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    arka_uc.tahmin(kareler[0][1])
+    ilk = time.perf_counter() - t0
+
+    sureler = []
+    etiketler = {}
+    for i in range(warmup + iters):
+        ad, frame = kareler[i % len(kareler)]
+        t0 = time.perf_counter()
+        tespitler = arka_uc.tahmin(frame)
+        if i >= warmup:
+            sureler.append(time.perf_counter() - t0)
+        etiketler[ad] = sorted({e for e, _, _ in tespitler})
+
+    ort = float(np.mean(sureler))
+    return {
+        "load_s": round(yukleme, 3),
+        "first_ms": round(ilk * 1000.0, 2),
+        "infer": yuzdelik(sureler),
+        "fps": round(1.0 / ort, 1) if ort > 0 else None,
+        "labels": etiketler,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tabela arka uç kıyaslaması (.pt / .onnx)")
+    ap.add_argument("models", nargs="+", help="model dosyaları; ilki uyum için referans")
+    ap.add_argument("--imgsz", type=int, default=320)
+    ap.add_argument("--conf", type=float, default=0.5)
+    ap.add_argument("--threads", type=int, default=2, help="ONNX intra-op thread sayısı")
+    ap.add_argument("--size", default="640x480", help="kamera kare boyu WxH")
+    ap.add_argument("--no-roi", action="store_true", help="tabela ROI'si yerine tam kare")
+    ap.add_argument("--iters", type=int, default=50)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--json", help="sonucu JSON dosyasına yaz")
+    args = ap.parse_args()
+
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    roi = None if args.no_roi else (0.5, 0.0, 1.0, 0.6)
+    kareler = kare_seti(w, h, roi)
+
+    sonuc = {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "machine": platform.machine(),
+                 "imgsz": args.imgsz, "threads": args.threads, "roi": roi,
+                 "input": list(kareler[0][1].shape), "iters": args.iters},
+        "results": {},
+    }
+    for yol in args.models:
+        sonuc["results"][yol] = model_olc(yol, kareler, args.imgsz, args.conf,
+                                          args.threads, args.iters, args.warmup)
+
+    ref = sonuc["results"][args.models[0]]
+    print(f"\n{'model':<36} {'yükleme':>8} {'ilk':>8} {'p50':>8} {'p95':>8} {'fps':>6} {'hız':>6} {'uyum':>5}")
+    for yol, r in sonuc["results"].items():
+        uyum = np.mean([r["labels"][ad] == ref["labels"][ad] for ad in ref["labels"]])
+        hiz = ref["infer"]["p50_ms"] / r["infer"]["p50_ms"] if r["infer"]["p50_ms"] > 0 else 0.0
+        r["speedup_p50"] = round(hiz, 2)
+        r["agreement"] = round(float(uyum), 3)
+        print(f"{os.path.basename(yol):<36} {r['load_s']:7.2f}s {r['first_ms']:6.1f}ms"
+              f" {r['infer']['p50_ms']:6.1f}ms {r['infer']['p95_ms']:6.1f}ms"
+              f" {r['fps']:6.1f} {hiz:5.2f}x {uyum:5.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(sonuc, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 from gpiozero import Motor, PWMOutputDevice
 
 class Vehicle:
+    """
+    Yön ve PWM değerlerini hatırlar; pinlere yalnız değişiklik olduğunda yazar.
+    İşleme döngüsü her karede forward_*() çağırsa da durağan durumda GPIO trafiği olmaz.
+    """
+
     def __init__(self):
         # Sol motor (INA, INB)
         self.motor_left = Motor(forward=27, backward=22)
@@ -11,31 +16,50 @@ class Vehicle:
         self.pwm_left = PWMOutputDevice(18)  # ENA
         self.pwm_right = PWMOutputDevice(19) # ENB
 
+        # Son yazılan durum (None → henüz yazılmadı)
+        self.direction = None    # "forward" | "backward" | None
+        self.left_speed = None
+        self.right_speed = None
+
       #  self.stop()  # İlk başta motorlar durur
 
+    def set_state(self, direction, left, right):
+        """
+        Tek çağrıda yön + iki PWM değeri. direction None ise yön değişmez.
+        Yalnız farklı olan çıkışlar pinlere yazılır.
+        """
+        if direction is not None and direction != self.direction:
+            if direction == "forward":
+                self.motor_left.forward()
+                self.motor_right.forward()
+            elif direction == "backward":
+                self.motor_left.backward()
+                self.motor_right.backward()
+            else:
+                raise ValueError(f"Geçersiz yön: {direction}")
+            self.direction = direction
+
+        self.set_speed(left, right)
+
     def set_speed(self, left_speed, right_speed):
-        self.pwm_left.value = left_speed
-        self.pwm_right.value = right_speed
+        if left_speed != self.left_speed:
+            self.pwm_left.value = left_speed
+            self.left_speed = left_speed
+        if right_speed != self.right_speed:
+            self.pwm_right.value = right_speed
+            self.right_speed = right_speed
 
     def forward_fast(self):
-        self.motor_left.forward()
-        self.motor_right.forward()
-        self.set_speed(1.0, 1.0)
+        self.set_state("forward", 1.0, 1.0)
 
     def forward_normal(self):
-        self.motor_left.forward()
-        self.motor_right.forward()
-        self.set_speed(0.8, 0.8)
+        self.set_state("forward", 0.8, 0.8)
 
     def forward_slow(self):
-        self.motor_left.forward()
-        self.motor_right.forward()
-        self.set_speed(0.5, 0.5)
+        self.set_state("forward", 0.5, 0.5)
 
     def backward(self):
-        self.motor_left.backward()
-        self.motor_right.backward()
-        self.set_speed(1.0, 1.0)
+        self.set_state("backward", 1.0, 1.0)
 
     def stop(self):
         self.set_speed(0, 0)
@@ -0,0 +1,103 @@
+import threading
+import time
+
+
+def gorev_dongusu_hesapla(servo, deger):
+    """
+    Sürekli direksiyon değeri [-1, 1] → duty cycle.
+    0 merkez; +1 servo.sag_gorev_dongusu, −1 servo.sol_gorev_dongusu (iki yan ayrı ölçekli).
+    """
+    deger = min(max(float(deger), -1.0), 1.0)
+    merkez = servo.merkez_gorev_dongusu
+    if deger >= 0:
+        return merkez + deger * (servo.sag_gorev_dongusu - merkez)
+    return merkez + deger * (merkez - servo.sol_gorev_dongusu)
+
+
+class DireksiyonAktuator(threading.Thread):
+    """
+    Direksiyon servosunu kendi thread'inden süren asenkron aktüatör.
+    - komut(karar) / aci(deger) hemen döner; yalnız en son hedef saklanır (eskiler ezilir).
+    - Servonun zaten bulunduğu konumu tekrar eden komutlar uygulanmaz
+      (sürekli değerler dc_adim adımına yuvarlanır).
+    - Her uygulamadan sonra hareket büyüklüğüyle orantılı (tam tur = settle_s) beklenir;
+      bu bekleme çağıranı değil yalnız bu thread'i tutar.
+
+    servo: gorev_dongusu_ayarla(dc) ve sag/sol/merkez_gorev_dongusu alanları olan
+    herhangi bir nesne (ServoKontrol ya da donanımsız bir taklit).
+    uygulandi_fn(etiket, t): komut servoya uygulandığında çağrılır (etiket: komutu veren
+    karenin kimliği; gecikme izi için).
+    """
+
+    def __init__(self, servo, settle_s=0.3, dc_adim=0.05, uygulandi_fn=None):
+        super().__init__(daemon=True)
+        self.servo = servo
+        self.settle_s = settle_s
+        self.dc_adim = dc_adim
+        self._tam_aralik = abs(servo.sag_gorev_dongusu - servo.sol_gorev_dongusu) or 1.0
+
+        self._cond = threading.Condition()
+        self._hedef = None      # uygulanacak duty cycle
+        self._etiket = None     # hedefi veren karenin kimliği
+        self.uygulandi_fn = uygulandi_fn
+        self._mevcut = getattr(servo, "merkez_gorev_dongusu", None)  # servo merkezde başlar
+        self._durdur = False
+
+        self.uygulanan = 0      # servoya giden komut sayısı
+        self.atlanan = 0        # konum değişmediği için atlanan komut sayısı
+
+    def _gorev_dongusu(self, karar):
+        if karar == "Sag":
+            return self.servo.sag_gorev_dongusu
+        if karar == "Sol":
+            return self.servo.sol_gorev_dongusu
+        return self.servo.merkez_gorev_dongusu
+
+    def komut(self, karar, etiket=None):
+        """ "Sag" | "Sol" | diğer (düz) → hedef konum; beklemeden döner. """
+        self._hedefle(self._gorev_dongusu(karar), etiket)
+
+    def aci(self, deger, etiket=None):
+        """ Sürekli direksiyon değeri [-1, 1] → hedef konum; beklemeden döner. """
+        dc = gorev_dongusu_hesapla(self.servo, deger)
+        self._hedefle(round(round(dc / self.dc_adim) * self.dc_adim, 4), etiket)
+
+    def _hedefle(self, dc, etiket=None):
+        with self._cond:
+            if dc == self._hedef or (self._hedef is None and dc == self._mevcut):
+                self.atlanan += 1
+                return
+            self._hedef = dc
+            self._etiket = etiket
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._durdur and self._hedef is None:
+                    self._cond.wait()
+                if self._durdur:
+                    return
+                dc, self._hedef = self._hedef, None
+                etiket = self._etiket
+
+            if dc != self._mevcut:
+                fark = abs(dc - self._mevcut) if self._mevcut is not None else self._tam_aralik
+                self.servo.gorev_dongusu_ayarla(dc)
+                self._mevcut = dc
+                self.uygulanan += 1
+                if self.uygulandi_fn is not None:
+                    self.uygulandi_fn(etiket, time.monotonic())
+
+                # settle: servo hareketini tamamlasın (bu sürede gelenlerden sonuncusu uygulanır)
+                bekle = self.settle_s * min(fark / self._tam_aralik, 1.0)
+                # yeni komutun notify'ı beklemeyi kısaltmaz; yalnız durdur() erken bitirir
+                with self._cond:
+                    self._cond.wait_for(lambda: self._durdur, timeout=bekle)
+
+    def durdur(self, timeout=1.0):
+        with self._cond:
+            self._durdur = True
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout=timeout)
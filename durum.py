@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class PaylasimliDurum:
+    """
+    Sürümlü, paylaşılan durum (Main.STATE).
+    - Her yazım yeni bir (sürüm, sözlük) anlık görüntüsü yayınlar; yayınlanan sözlük bir
+      daha değiştirilmez. Okuyucular tek bir referansı okur → kilitsiz ve yırtılmasız.
+    - guncelle(**alanlar) birden fazla alanı tek sürümde değiştirir; değer değişmediyse
+      sürüm artmaz.
+    - telemetri: her karede yazılan alanlar (ör. delta_px). Yalnız bunlar değiştiyse yeni
+      görüntü yine yayınlanır ama sürüm en fazla telemetri_s'de bir artar; böylece
+      bekle() denetim alanları (mod, hız, karar, tabela) değişince hemen, telemetri için
+      ise en sık telemetri_s'de bir uyanır.
+    - bekle(since, timeout): sürüm since'ten büyük olana kadar bekler (long-poll).
+
+    Alanlar tek tek slot değil, bir arada değişmez sözlüktür: çok alanlı güncelleme tek
+    referans atamasıyla yayınlanır, okuyucu hiçbir zaman yarım güncelleme görmez.
+    """
+
+    __slots__ = ("_snap", "_cond", "_telemetri", "telemetri_s", "_son_artis")
+
+    def __init__(self, telemetri=(), telemetri_s=1.0, **alanlar):
+        self._snap = (0, dict(alanlar))
+        self._cond = threading.Condition()
+        self._telemetri = frozenset(telemetri)
+        self.telemetri_s = telemetri_s
+        self._son_artis = 0.0
+
+    # ---------- okuma (kilitsiz) ----------
+    def __getitem__(self, anahtar):
+        return self._snap[1][anahtar]
+
+    def get(self, anahtar, varsayilan=None):
+        return self._snap[1].get(anahtar, varsayilan)
+
+    @property
+    def version(self):
+        return self._snap[0]
+
+    def snapshot(self):
+        """ (sürüm, sözlük) – sözlük salt okunur kabul edilmeli. """
+        return self._snap
+
+    def sozluk(self):
+        """ JSON için sürüm eklenmiş kopya. """
+        version, d = self._snap
+        return dict(d, version=version)
+
+    # ---------- yazma ----------
+    def __setitem__(self, anahtar, deger):
+        self.guncelle(**{anahtar: deger})
+
+    def guncelle(self, **alanlar):
+        with self._cond:
+            version, d = self._snap
+            degisen = [k for k, v in alanlar.items() if k not in d or d[k] != v]
+            if not degisen:
+                return version
+            yeni = dict(d)
+            yeni.update(alanlar)
+            now = time.monotonic()
+            if self._telemetri.issuperset(degisen) and now - self._son_artis < self.telemetri_s:
+                self._snap = (version, yeni)   # okuyan görür, long-poll uyanmaz
+                return version
+            self._son_artis = now
+            self._snap = (version + 1, yeni)
+            self._cond.notify_all()
+            return version + 1
+
+    # ---------- değişiklik bekleme ----------
+    def bekle(self, since, timeout=None):
+        """ Sürüm > since olunca (ya da timeout) en son anlık görüntüyü döner. """
+        with self._cond:
+            self._cond.wait_for(lambda: self._snap[0] > since, timeout)
+            return self._snap
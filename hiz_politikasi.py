@@ -0,0 +1,127 @@
+import time
+
+# Hız sıralaması: politika kullanıcı hızını yalnız düşürebilir (üst sınır) ya da durdurabilir
+HIZ_SIRASI = ("stop", "slow", "normal", "fast")
+
+# Durumlar
+SURUS = "SURUS"
+STOPPED_FOR_SIGN = "STOPPED_FOR_SIGN"
+WAIT_GREEN = "WAIT_GREEN"
+SPEED_LIMIT_30 = "SPEED_LIMIT_30"
+
+
+class HizPolitikasi:
+    """
+    Tabela tepkileri için zamanlı durum makinesi (sleep yok; her döngüde hiz() çağrılır).
+
+      SURUS ──dur_tabelasi──▶ STOPPED_FOR_SIGN ──dur_s doldu──▶ SURUS
+      SURUS ──isik_kirmizi──▶ WAIT_GREEN ──isik_yesil / kırmızı kayboldu──▶ SURUS
+      otuz_hiz → SPEED_LIMIT_30 (hız en fazla "slow"), elli_hiz → sınır kalkar
+
+    - Histerezis: bir etiket, giris_sayisi ardışık dedektör sonucunda görülmeden tepki
+      başlamaz; cikis_s boyunca görülmezse "kayboldu" sayılır.
+    - Etiket başına soğuma: bir tepki bittikten sonra aynı etiket bekleme_s dolmadan ve
+      tabela görüşten çıkmadan yeniden tetiklemez (aynı DUR tabelası tekrar tekrar durdurmaz).
+    Tüm zamanlar time.monotonic().
+    """
+
+    def __init__(self, min_conf=0.7, giris_sayisi=2, cikis_s=1.0,
+                 dur_s=3.0, bekleme_s=5.0, kirmizi_kayip_s=2.0, gecerlilik_s=1.0):
+        self.min_conf = min_conf
+        self.giris_sayisi = giris_sayisi
+        self.cikis_s = cikis_s
+        self.dur_s = dur_s
+        self.bekleme_s = bekleme_s
+        self.kirmizi_kayip_s = kirmizi_kayip_s
+        self.gecerlilik_s = gecerlilik_s
+
+        self.durum = SURUS
+        self.durum_zamani = time.monotonic()
+        self.limit = None              # "slow" → SPEED_LIMIT_30
+
+        self._son_sonuc = None         # en son işlenen sonuc zamanı
+        self._ardisik = {}             # etiket → ardışık görülme sayısı
+        self._son_gorulme = {}         # etiket → son görüldüğü an
+        self._soguma = {}              # etiket → bu andan önce yeniden tetiklemez
+        self._kurulu = {}              # etiket → False: görüşten çıkması bekleniyor
+
+    # ---------- yardımcılar ----------
+    def _gecis(self, durum, now):
+        self.durum = durum
+        self.durum_zamani = now
+
+    def _gorunur(self, etiket, now):
+        return now - self._son_gorulme.get(etiket, -1e9) <= self.cikis_s
+
+    def _onayli(self, etiket):
+        return self._ardisik.get(etiket, 0) >= self.giris_sayisi
+
+    def _tetiklenebilir(self, etiket, now):
+        return (self._onayli(etiket) and self._kurulu.get(etiket, True)
+                and now >= self._soguma.get(etiket, 0.0))
+
+    def _tuket(self, etiket, now):
+        """ Tepki başladı: etiket görüşten çıkana ve soğuma dolana kadar yeniden tetiklemez. """
+        self._kurulu[etiket] = False
+        self._soguma[etiket] = now + self.bekleme_s
+
+    def _sonuc_isle(self, sonuc, now):
+        _, sonuc_zamani, tespitler = sonuc
+        if sonuc_zamani == self._son_sonuc or now - sonuc_zamani > self.gecerlilik_s:
+            return
+        self._son_sonuc = sonuc_zamani
+        etiketler = {e for e, p, _ in tespitler if p >= self.min_conf}
+        for e in etiketler:
+            self._ardisik[e] = self._ardisik.get(e, 0) + 1
+            self._son_gorulme[e] = sonuc_zamani
+        for e in list(self._ardisik):
+            if e not in etiketler:
+                self._ardisik[e] = 0
+
+    def _yeniden_kur(self, now):
+        for e, kurulu in self._kurulu.items():
+            if not kurulu and not self._gorunur(e, now):
+                self._kurulu[e] = True
+
+    # ---------- ana adım ----------
+    def guncelle(self, sonuc, now=None):
+        now = time.monotonic() if now is None else now
+        self._sonuc_isle(sonuc, now)
+        self._yeniden_kur(now)
+
+        # hız sınırı (diğer durumlardan bağımsız)
+        if self._tetiklenebilir("otuz_hiz", now):
+            self.limit = "slow"
+            self._tuket("otuz_hiz", now)
+        elif self._tetiklenebilir("elli_hiz", now):
+            self.limit = None
+            self._tuket("elli_hiz", now)
+
+        if self.durum == SURUS:
+            if self._tetiklenebilir("isik_kirmizi", now):
+                self._tuket("isik_kirmizi", now)
+                self._gecis(WAIT_GREEN, now)
+            elif self._tetiklenebilir("dur_tabelasi", now):
+                self._tuket("dur_tabelasi", now)
+                self._gecis(STOPPED_FOR_SIGN, now)
+
+        elif self.durum == STOPPED_FOR_SIGN:
+            if now - self.durum_zamani >= self.dur_s:
+                self._gecis(SURUS, now)
+
+        elif self.durum == WAIT_GREEN:
+            yesil = self._onayli("isik_yesil") and self._gorunur("isik_yesil", now)
+            kirmizi_yok = now - self._son_gorulme.get("isik_kirmizi", -1e9) > self.kirmizi_kayip_s
+            if yesil or kirmizi_yok:
+                self._gecis(SURUS, now)
+
+        return self.durum
+
+    def hiz(self, istenen, sonuc, now=None):
+        """ Uygulanacak hız ve aktif tepki adı (yoksa None); beklemeden döner. """
+        durum = self.guncelle(sonuc, now)
+        if durum in (STOPPED_FOR_SIGN, WAIT_GREEN):
+            return "stop", durum
+        if self.limit is not None and HIZ_SIRASI.index(istenen) > HIZ_SIRASI.index(self.limit):
+            return self.limit, SPEED_LIMIT_30
+        return istenen, None
@@ -0,0 +1,175 @@
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class KareHalkasi:
+    """
+    Ön-ayrılmış N yuvalı kare halkası (kamera → işleme, süreçler arası yayın/tabela).
+    Tek yazan, kuyruk yok: yazan sıradaki yuvaya tek kopya yapar, okuyan en yeni yuvayı
+    kopyasız görür. Eski kare "atılmaz"; üzerine yazılır.
+
+    - Her kare 1'den artan bir kimlik ve yakalama zamanı (time.monotonic) taşır.
+    - al(onceki) en yeni kareyi kiralar: birak(kimlik) çağrılana dek yazan o yuvayı atlar
+      (işleme ne kadar sürerse sürsün kare altında değişmez). son(onceki) kiralamadan bakar;
+      iş bitince gecerli(kimlik) ile yuvanın değişmediği doğrulanır.
+    - Sayaçlar: yazilan (toplam kare), okuyan tarafında alinan / atlanan (hiç görülmeden
+      üzerine yazılan kare) / cakisma (okunurken yazılan yuva → yeniden deneme).
+    - paylasimli=True → multiprocessing.shared_memory; diğer süreçte
+      KareHalkasi.bagla(*halka.tanim()). Thread modunda bekleme Condition ile, süreç
+      modunda kısa yoklama ile yapılır.
+
+    Bellek düzeni: int64 [son_kimlik, son_yuva, kimlik × n, kira × n] | float64 [zaman × n] | n × kare
+    """
+
+    def __init__(self, shape, n=4, dtype=np.uint8, paylasimli=False, ad=None):
+        self.shape = tuple(shape)
+        self.n = n
+        self.dtype = np.dtype(dtype)
+        kare_bayt = int(np.prod(self.shape)) * self.dtype.itemsize
+        baslik_bayt = 8 * (2 + 2 * n)
+        zaman_bayt = 8 * n
+        toplam = baslik_bayt + zaman_bayt + n * kare_bayt
+
+        self.paylasimli = paylasimli or ad is not None
+        self._sahip = ad is None
+        self._shm = None
+        if not self.paylasimli:
+            tampon = bytearray(toplam)
+        elif self._sahip:
+            self._shm = shared_memory.SharedMemory(create=True, size=toplam)
+            tampon = self._shm.buf
+        else:
+            try:
+                # bağlanan süreç segmenti silmemeli (Python ≥ 3.13)
+                self._shm = shared_memory.SharedMemory(name=ad, track=False)
+            except TypeError:
+                self._shm = shared_memory.SharedMemory(name=ad)
+            tampon = self._shm.buf
+
+        self._baslik = np.ndarray((2 + 2 * n,), np.int64, tampon, 0)
+        self._kimlik = self._baslik[2:2 + n]
+        self._kira = self._baslik[2 + n:]
+        self._zaman = np.ndarray((n,), np.float64, tampon, baslik_bayt)
+        self._yuvalar = np.ndarray((n,) + self.shape, self.dtype, tampon, baslik_bayt + zaman_bayt)
+        if self._sahip:
+            self._baslik[:] = 0
+            self._baslik[1] = -1
+
+        self._cond = None if self.paylasimli else threading.Condition()
+        self._sira = 0
+        # okuyan tarafı sayaçları (her süreç/okuyan nesnesi kendi sayar)
+        self.alinan = 0
+        self.atlanan = 0
+        self.cakisma = 0
+
+    @classmethod
+    def bagla(cls, ad, shape, n, dtype):
+        return cls(shape, n, dtype, ad=ad)
+
+    def tanim(self):
+        """ Alt sürece verilecek (ad, shape, n, dtype) – pickle edilebilir. """
+        return self._shm.name, self.shape, self.n, self.dtype.str
+
+    # ---------- yazan ----------
+    def yaz(self, frame, zaman=None):
+        """ frame'i sıradaki boş yuvaya kopyalar (kaynak kamera tamponu olabilir). DÖNÜŞ: kimlik """
+        kimlik = int(self._baslik[0]) + 1
+        for _ in range(self.n):
+            i = self._sira
+            self._sira = (self._sira + 1) % self.n
+            if self._kira[i]:
+                continue
+            eski = int(self._kimlik[i])
+            self._kimlik[i] = -1              # yazılıyor: okuyan bu yuvayı geçersiz görür
+            if self._kira[i]:                 # tam bu arada kiralandı → dokunma
+                self._kimlik[i] = eski
+                continue
+            break
+        else:
+            return 0                          # tüm yuvalar kirada (n ≥ 2 ve tek kiracıyla olmaz)
+
+        np.copyto(self._yuvalar[i], frame)
+        self._zaman[i] = time.monotonic() if zaman is None else zaman
+        self._kimlik[i] = kimlik
+        self._baslik[1] = i
+        self._baslik[0] = kimlik
+        if self._cond is not None:
+            with self._cond:
+                self._cond.notify_all()
+        return kimlik
+
+    @property
+    def yazilan(self):
+        return int(self._baslik[0])
+
+    # ---------- okuyan ----------
+    def _en_yeni(self, onceki):
+        kimlik = int(self._baslik[0])
+        if kimlik <= onceki:
+            return 0, -1
+        return kimlik, int(self._baslik[1])
+
+    def _say(self, onceki, kimlik):
+        self.alinan += 1
+        if onceki:
+            self.atlanan += kimlik - onceki - 1
+
+    def son(self, onceki=0):
+        """ onceki'den yeni kare varsa (kimlik, zaman, yuva görünümü), yoksa (onceki, 0.0, None). """
+        kimlik, i = self._en_yeni(onceki)
+        if not kimlik:
+            return onceki, 0.0, None
+        zaman = float(self._zaman[i])
+        if int(self._kimlik[i]) != kimlik:
+            self.cakisma += 1
+            return onceki, 0.0, None          # tam o an üzerine yazılıyor
+        self._say(onceki, kimlik)
+        return kimlik, zaman, self._yuvalar[i]
+
+    def al(self, onceki=0, timeout=None):
+        """
+        En yeni kareyi kiralar (gerekirse timeout kadar bekler).
+        DÖNÜŞ: (kimlik, zaman, yuva görünümü) ya da (onceki, 0.0, None); iş bitince birak(kimlik).
+        """
+        bitis = None if timeout is None else time.monotonic() + timeout
+        while True:
+            kimlik, i = self._en_yeni(onceki)
+            if kimlik:
+                self._kira[i] = 1
+                if int(self._kimlik[i]) == kimlik:
+                    self._say(onceki, kimlik)
+                    return kimlik, float(self._zaman[i]), self._yuvalar[i]
+                self._kira[i] = 0
+                self.cakisma += 1
+                continue
+            kalan = None if bitis is None else bitis - time.monotonic()
+            if kalan is not None and kalan <= 0:
+                return onceki, 0.0, None
+            if self._cond is not None:
+                with self._cond:
+                    self._cond.wait_for(lambda: int(self._baslik[0]) > onceki, kalan)
+            else:
+                time.sleep(0.001 if kalan is None else min(0.001, kalan))
+
+    def birak(self, kimlik):
+        i = np.flatnonzero(self._kimlik == kimlik)
+        if len(i):
+            self._kira[i[0]] = 0
+
+    def gecerli(self, kimlik):
+        return bool((self._kimlik == kimlik).any())
+
+    def sayaclar(self):
+        return {"yazilan": self.yazilan, "alinan": self.alinan,
+                "atlanan": self.atlanan, "cakisma": self.cakisma}
+
+    # ---------- kapatma ----------
+    def kapat(self):
+        self._baslik = self._kimlik = self._kira = self._zaman = self._yuvalar = None
+        if self._shm is not None:
+            self._shm.close()
+            if self._sahip:
+                self._shm.unlink()
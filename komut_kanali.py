@@ -0,0 +1,167 @@
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+
+# Paket: magic(2) sürüm(1) anahtar(4) seq(4) komut(1) değer(2)  → 14 bayt, little-endian
+# Onay: magic(2) sürüm(1) seq(4) durum(1)                       → 8 bayt
+PAKET = struct.Struct("<2sBIIBh")
+ONAY = struct.Struct("<2sBIB")
+MAGIC = b"OA"
+SURUM = 1
+
+# komut kodları
+CMD_PING = 0
+CMD_MODE = 1    # değer: 0 AUTO, 1 MANUAL, 2 STOP
+CMD_SPEED = 2   # değer: 0 stop, 1 slow, 2 normal, 3 fast
+CMD_STEER = 3   # değer: -1000..1000 → direksiyon [-1, 1] (MANUAL modda)
+
+# onay durumları
+ACK_OK = 0
+ACK_TEKRAR = 1   # seq daha önce işlendi (yeniden gönderim) → uygulanmadı
+ACK_GECERSIZ = 2
+
+MODLAR = ("AUTO", "MANUAL", "STOP")
+HIZLAR = ("stop", "slow", "normal", "fast")
+
+
+def anahtar(token):
+    return zlib.crc32(token.encode("utf-8")) & 0xFFFFFFFF
+
+
+def paket_coz(veri, key):
+    """ Ham UDP paketi → (seq, komut sözlüğü | None); biçim/anahtar hatalıysa None. """
+    if len(veri) != PAKET.size:
+        return None
+    magic, surum, k, seq, cmd, deger = PAKET.unpack(veri)
+    if magic != MAGIC or surum != SURUM or k != key:
+        return None
+    if cmd == CMD_PING:
+        return seq, {}
+    if cmd == CMD_MODE and 0 <= deger < len(MODLAR):
+        return seq, {"mode": MODLAR[deger]}
+    if cmd == CMD_SPEED and 0 <= deger < len(HIZLAR):
+        return seq, {"speed": HIZLAR[deger]}
+    if cmd == CMD_STEER:
+        return seq, {"steer": max(-1000, min(1000, deger)) / 1000.0}
+    return seq, None
+
+
+class KomutKanali(threading.Thread):
+    """
+    HTTP'siz, düşük gecikmeli UDP komut kanalı. Her paket sıra numaralıdır ve kendi
+    thread'inde komut_fn ile uygulanıp aynı seq ile onaylanır. İstemci onay gelmezse
+    aynı seq ile yeniden gönderir; daha önce görülen (ya da eski) seq tekrar uygulanmaz.
+    """
+
+    def __init__(self, komut_fn, stop_event, token, host="0.0.0.0", port=5005):
+        super().__init__(daemon=True)
+        self.komut_fn = komut_fn
+        self.stop_event = stop_event
+        self.key = anahtar(token)
+        self.host = host
+        self.port = port
+
+        self._son_seq = {}      # istemci adresi → son uygulanan seq
+        self.uygulanan = 0
+        self.reddedilen = 0
+
+    def run(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.settimeout(0.2)
+        print(f"UDP komut kanalı: {self.port}")
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    veri, adres = sock.recvfrom(64)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+
+                cozum = paket_coz(veri, self.key)
+                if cozum is None:
+                    self.reddedilen += 1
+                    continue        # yabancı paket → sessizce at
+                seq, data = cozum
+
+                if data is None:
+                    durum = ACK_GECERSIZ
+                elif seq <= self._son_seq.get(adres, -1):
+                    durum = ACK_TEKRAR
+                else:
+                    self._son_seq[adres] = seq
+                    self.komut_fn(data)
+                    self.uygulanan += 1
+                    durum = ACK_OK
+
+                try:
+                    sock.sendto(ONAY.pack(MAGIC, SURUM, seq, durum), adres)
+                except OSError:
+                    pass
+        finally:
+            sock.close()
+
+
+class KomutIstemcisi:
+    """ Operatör tarafı: komut gönderir, onayı bekler, gelmezse aynı seq ile yeniden dener. """
+
+    def __init__(self, host, token, port=5005, timeout=0.05, deneme=3):
+        self.adres = (host, port)
+        self.key = anahtar(token)
+        self.timeout = timeout
+        self.deneme = deneme
+        # seq, sunucuda istemci başına artan olmalı; oturumlar arası çakışmasın diye zamandan başlar
+        self.seq = int(time.time() * 1000) & 0x7FFFFFFF
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.settimeout(timeout)
+
+    def gonder(self, cmd, deger=0):
+        """ DÖNÜŞ: (onay durumu, gidiş-dönüş sn) ya da (None, None) """
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        paket = PAKET.pack(MAGIC, SURUM, self.key, self.seq, cmd, deger)
+        t0 = time.perf_counter()
+        for _ in range(self.deneme):
+            self.sock.sendto(paket, self.adres)
+            try:
+                while True:
+                    veri, _ = self.sock.recvfrom(16)
+                    if len(veri) != ONAY.size:
+                        continue
+                    magic, surum, seq, durum = ONAY.unpack(veri)
+                    if magic == MAGIC and seq == self.seq:
+                        return durum, time.perf_counter() - t0
+            except socket.timeout:
+                continue
+        return None, None
+
+    def mod(self, mode):
+        return self.gonder(CMD_MODE, MODLAR.index(mode.upper()))
+
+    def hiz(self, speed):
+        return self.gonder(CMD_SPEED, HIZLAR.index(speed.lower()))
+
+    def direksiyon(self, deger):
+        return self.gonder(CMD_STEER, int(round(max(-1.0, min(1.0, deger)) * 1000)))
+
+
+if __name__ == "__main__":
+    import sys
+
+    # örn: python komut_kanali.py 192.168.1.20 speed slow | mode MANUAL | steer -0.5 | ping
+    host, komut = sys.argv[1], sys.argv[2]
+    ist = KomutIstemcisi(host, token=os.environ.get("CMD_TOKEN", "SECRET"))
+    if komut == "mode":
+        sonuc = ist.mod(sys.argv[3])
+    elif komut == "speed":
+        sonuc = ist.hiz(sys.argv[3])
+    elif komut == "steer":
+        sonuc = ist.direksiyon(float(sys.argv[3]))
+    else:
+        sonuc = ist.gonder(CMD_PING)
+    durum, rtt = sonuc
+    print("onay yok" if durum is None else f"durum={durum} rtt={rtt * 1000:.1f} ms")
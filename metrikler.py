@@ -0,0 +1,145 @@
+import subprocess
+import time
+
+# Prometheus metin biçimi (text/plain; version=0.0.4) için yardımcılar + Pi sağlık okumaları.
+# Yazanlar tek thread'dir (işleme döngüsü, kamera, kodlayıcı); okuyan /metrics kilit almaz.
+
+# Aşama süreleri için kova sınırları (sn): 0.5 ms … 0.5 s
+KOVALAR = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.2, 0.5)
+
+# vcgencmd get_throttled bitleri
+KISILMA_BITLERI = {
+    0: "under_voltage", 1: "freq_capped", 2: "throttled", 3: "soft_temp_limit",
+    16: "under_voltage_occurred", 17: "freq_capped_occurred",
+    18: "throttled_occurred", 19: "soft_temp_limit_occurred",
+}
+
+
+class HizSayaci:
+    """
+    Kayan pencereli olay hızı (FPS): tik() olay anını sabit boyutlu halkaya yazar,
+    hiz() son pencere_s içindeki olaylardan saniyedeki olayı hesaplar. Başlangıçtan beri
+    ortalama değil; takılma birkaç saniyede görünür.
+    """
+
+    def __init__(self, pencere_s=5.0, n=256):
+        self.pencere_s = pencere_s
+        self.n = n
+        self._t = [0.0] * n
+        self._i = 0
+        self.toplam = 0
+
+    def tik(self, t=None):
+        self._t[self._i] = time.monotonic() if t is None else t
+        self._i = (self._i + 1) % self.n
+        self.toplam += 1
+
+    def hiz(self, now=None):
+        now = time.monotonic() if now is None else now
+        pencere = [t for t in list(self._t) if t > 0.0 and now - t <= self.pencere_s]
+        if len(pencere) < 2:
+            return 0.0
+        # halka pencereden küçükse ilk–son aralığı kullanılır (doygunlukta da doğru)
+        return (len(pencere) - 1) / max(max(pencere) - min(pencere), 1e-6)
+
+
+class Histogram:
+    """ Etiket başına (ör. aşama adı) Prometheus histogramı: kova sayıları, toplam, adet. """
+
+    def __init__(self, kovalar=KOVALAR):
+        self.kovalar = kovalar
+        self._veri = {}     # etiket → [kova sayıları..., +Inf], toplam, adet
+
+    def gozlem(self, etiket, deger):
+        v = self._veri.get(etiket)
+        if v is None:
+            v = self._veri[etiket] = [[0] * (len(self.kovalar) + 1), 0.0, 0]
+        sayilar = v[0]
+        for i, sinir in enumerate(self.kovalar):
+            if deger <= sinir:
+                sayilar[i] += 1
+                break
+        else:
+            sayilar[-1] += 1
+        v[1] += deger
+        v[2] += 1
+
+    def ogeler(self):
+        return list(self._veri.items())
+
+
+class MetrikYazici:
+    """ Prometheus metin biçiminde satır toplayıcı (her metrik için HELP/TYPE bir kez). """
+
+    def __init__(self, onek="otonom_"):
+        self.onek = onek
+        self._satirlar = []
+        self._tanimli = set()
+
+    @staticmethod
+    def _etiket(etiketler):
+        if not etiketler:
+            return ""
+        kacis = {ord("\\"): "\\\\", ord('"'): '\\"', ord("\n"): "\\n"}
+        return "{" + ",".join(f'{k}="{str(v).translate(kacis)}"' for k, v in etiketler.items()) + "}"
+
+    def _baslik(self, ad, tur, yardim):
+        if ad not in self._tanimli:
+            self._tanimli.add(ad)
+            self._satirlar.append(f"# HELP {ad} {yardim}")
+            self._satirlar.append(f"# TYPE {ad} {tur}")
+
+    def _deger(self, ad, tur, yardim, deger, etiketler):
+        if deger is None:
+            return
+        ad = self.onek + ad
+        self._baslik(ad, tur, yardim)
+        metin = str(int(deger)) if isinstance(deger, int) else f"{float(deger):.6g}"
+        self._satirlar.append(f"{ad}{self._etiket(etiketler)} {metin}")
+
+    def gauge(self, ad, deger, yardim, **etiketler):
+        self._deger(ad, "gauge", yardim, deger, etiketler)
+
+    def counter(self, ad, deger, yardim, **etiketler):
+        self._deger(ad, "counter", yardim, deger, etiketler)
+
+    def histogram(self, ad, hist, yardim, etiket_adi):
+        ad = self.onek + ad
+        self._baslik(ad, "histogram", yardim)
+        for etiket, (sayilar, toplam, adet) in hist.ogeler():
+            birikimli = 0
+            for sinir, n in zip(hist.kovalar + (float("inf"),), list(sayilar)):
+                birikimli += n
+                le = "+Inf" if sinir == float("inf") else repr(sinir)
+                self._satirlar.append(
+                    f"{ad}_bucket{self._etiket({etiket_adi: etiket, 'le': le})} {birikimli}")
+            self._satirlar.append(f"{ad}_sum{self._etiket({etiket_adi: etiket})} {toplam:.6g}")
+            self._satirlar.append(f"{ad}_count{self._etiket({etiket_adi: etiket})} {adet}")
+
+    def metin(self):
+        return "\n".join(self._satirlar) + "\n"
+
+
+# ================== Pi SAĞLIĞI ==================
+def cpu_sicaklik():
+    """ °C ya da None (thermal_zone0 yoksa). """
+    try:
+        with open("/sys/class/thermal/thermal_zone0/temp") as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+def kisilma_durumu():
+    """ get_throttled bit maskesi ya da None; önce sysfs (ucuz), yoksa vcgencmd. """
+    try:
+        with open("/sys/devices/platform/soc/soc:firmware/get_throttled") as f:
+            return int(f.read().strip(), 16)
+    except (OSError, ValueError):
+        pass
+    try:
+        cikti = subprocess.run(["vcgencmd", "get_throttled"], capture_output=True,
+                               text=True, timeout=1.0).stdout
+        return int(cikti.strip().split("=")[1], 16)
+    except (OSError, ValueError, IndexError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabela modelini (YOLO .pt) Pi CPU'su için ONNX'e aktarır, isteğe bağlı nicemler.
+
+    python model_aktar.py weights/best.pt --imgsz 320 --quant int8
+    → weights/best_320_int8.onnx  (+ aynı adlı .json: etiketler, imgsz)
+
+--quant:
+  none  : fp32 ONNX (ultralytics export, simplify)
+  fp16  : ağırlıklar float16, giriş/çıkış float32 kalır (onnxconverter-common)
+  int8  : dinamik int8 nicemleme (onnxruntime.quantization); --calib verilirse
+          kalibrasyon görüntüleriyle statik int8 (QDQ) nicemleme
+
+Çıkan dosya tabela.OnnxArkaUc ile çalışır (TabelaDedektoru uzantıdan seçer);
+iki arka uç bench_tabela.py ile yan yana ölçülür.
+Bağımlılıklar yalnız aktarma makinesinde gerekir: ultralytics, onnx, onnxruntime
+(fp16 için onnxconverter-common).
+"""
+
+import argparse
+import glob
+import json
+import os
+
+
+def fp32_aktar(pt_path, imgsz, opset):
+    from ultralytics import YOLO
+
+    model = YOLO(pt_path)
+    cikti = model.export(format="onnx", imgsz=imgsz, opset=opset, simplify=True, dynamic=False)
+    return cikti, dict(model.names)
+
+
+def fp16_yap(kaynak, hedef):
+    import onnx
+    from onnxconverter_common import float16
+
+    model = onnx.load(kaynak)
+    model = float16.convert_float_to_float16(model, keep_io_types=True)
+    onnx.save(model, hedef)
+
+
+def int8_yap(kaynak, hedef, imgsz, calib_dir=None):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    if not calib_dir:
+        quantize_dynamic(kaynak, hedef, weight_type=QuantType.QUInt8)
+        return
+
+    import cv2
+    import numpy as np
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, quantize_static
+
+    from tabela import letterbox
+
+    class Okuyucu(CalibrationDataReader):
+        def __init__(self, model_path):
+            import onnxruntime as ort
+
+            self.ad = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]) \
+                .get_inputs()[0].name
+            yollar = sorted(p for uz in ("jpg", "jpeg", "png")
+                            for p in glob.glob(os.path.join(calib_dir, f"*.{uz}")))
+            self._it = iter(yollar)
+            self._tampon = np.empty((imgsz, imgsz, 3), np.uint8)
+
+        def get_next(self):
+            for yol in self._it:
+                img = cv2.imread(yol)
+                if img is None:
+                    continue
+                letterbox(img, self._tampon)
+                x = self._tampon[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+                return {self.ad: x}
+            return None
+
+    quantize_static(kaynak, hedef, Okuyucu(kaynak), quant_format=QuantFormat.QDQ,
+                    per_channel=True, weight_type=QuantType.QInt8,
+                    activation_type=QuantType.QUInt8)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="YOLO .pt → ONNX (+ fp16/int8) aktarma")
+    ap.add_argument("model", help="eğitilmiş .pt (örn. weights/best.pt)")
+    ap.add_argument("--imgsz", type=int, default=320, help="sabit giriş boyu (TabelaDedektoru imgsz)")
+    ap.add_argument("--quant", choices=("none", "fp16", "int8"), default="int8")
+    ap.add_argument("--calib", help="statik int8 için kalibrasyon görüntü klasörü")
+    ap.add_argument("--opset", type=int, default=12)
+    ap.add_argument("-o", "--out", help="çıktı .onnx (varsayılan: <model>_<imgsz>_<quant>.onnx)")
+    args = ap.parse_args()
+
+    kok = os.path.splitext(args.model)[0]
+    hedef = args.out or f"{kok}_{args.imgsz}_{args.quant}.onnx"
+
+    fp32, names = fp32_aktar(args.model, args.imgsz, args.opset)
+    if args.quant == "none":
+        if os.path.abspath(fp32) != os.path.abspath(hedef):
+            os.replace(fp32, hedef)
+    elif args.quant == "fp16":
+        fp16_yap(fp32, hedef)
+    else:
+        int8_yap(fp32, hedef, args.imgsz, args.calib)
+
+    # nicemleme model metadatasını taşımayabilir → etiketler yan dosyada
+    with open(os.path.splitext(hedef)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump({"names": {int(k): v for k, v in names.items()}, "imgsz": args.imgsz,
+                   "quant": args.quant, "kaynak": os.path.basename(args.model)},
+                  f, ensure_ascii=False, indent=1)
+
+    boyut = os.path.getsize(hedef) / 1e6
+    print(f"{hedef}  ({boyut:.1f} MB, imgsz={args.imgsz}, {args.quant})")
+
+
+if __name__ == "__main__":
+    main()
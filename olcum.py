@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+
+
+class AsamaProfil:
+    """
+    Kare içi aşama süreleri. SeritTakip.profil'e verilir; her aşama ekle(ad, saniye) ile yazılır.
+    basla() yeni kareyi başlatır, bitir() o karenin {aşama: saniye} sözlüğünü döner.
+    """
+
+    def __init__(self):
+        self.sureler = {}
+        self._t0 = None
+
+    def basla(self):
+        self.sureler = {}
+        self._t0 = time.perf_counter()
+
+    def ekle(self, ad, saniye):
+        self.sureler[ad] = self.sureler.get(ad, 0.0) + saniye
+
+    def bitir(self):
+        if self._t0 is not None:
+            self.sureler["total"] = time.perf_counter() - self._t0
+        return self.sureler
+
+
+def surec_baslangici():
+    """ Sürecin başladığı an (time.monotonic); Linux'ta /proc'tan, okunamazsa şimdi. """
+    simdi = time.monotonic()
+    try:
+        with open("/proc/self/stat") as f:
+            ticks = int(f.read().rsplit(")", 1)[1].split()[19])   # 22. alan: starttime
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        gecen = uptime - ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return simdi
+    return simdi - max(0.0, gecen)
+
+
+class BaslangicCizelgesi:
+    """
+    Açılış zaman çizelgesi: her olay (ör. "motors_ready", "first_frame", "first_actuation")
+    yalnız ilk işaretlendiğinde, süreç başlangıcına göre saniye olarak kaydedilir ve yazdırılır.
+    İçe aktarma süresi de dahil olsun diye başlangıç /proc'tan okunur.
+    """
+
+    def __init__(self, t0=None, yazdir=True):
+        self.t0 = surec_baslangici() if t0 is None else t0
+        self.yazdir = yazdir
+        self.olaylar = {}
+        self._lock = threading.Lock()
+
+    def isaretle(self, ad):
+        if ad in self.olaylar:          # hızlı yol: döngülerden her turda çağrılabilir
+            return self.olaylar[ad]
+        with self._lock:
+            if ad in self.olaylar:
+                return self.olaylar[ad]
+            t = round(time.monotonic() - self.t0, 3)
+            self.olaylar[ad] = t
+        if self.yazdir:
+            print(f"[açılış] +{t:.3f}s {ad}")
+        return t
+
+    def sozluk(self):
+        with self._lock:
+            return dict(sorted(self.olaylar.items(), key=lambda kv: kv[1]))
+
+
+# Kare izi kaydı: (kimlik, t_yakalama, t_alma, t_karar, t_gonderim, t_overlay, t_yayin,
+#                  karar, {aşama: saniye}, kodlama_s) – zamanlar time.monotonic()
+IZ_OLAYLARI = ("dequeue", "decision", "dispatch", "overlay", "publish")
+
+
+class GecikmeIzi:
+    """
+    Kare başına gecikme izi: yakalamadan kuyruktan alma, SeritTakip aşamaları, karar,
+    aktüatöre gönderim, overlay ve yayına verişe kadar.
+    - Tek yazan (işleme thread'i), kilitsiz halka: liste yuvasına atama GIL altında atomiktir;
+      okuyan listenin kopyasını alıp kimliğe göre sıralar.
+    - servo(kimlik, t): aktüatör thread'i komutun servoya gerçekten uygulandığı anı yazar
+      (en yeni komut kazandığından yalnız uygulanan karelerde servo_ms olur).
+    """
+
+    def __init__(self, n=512):
+        self.n = n
+        self._kayit = [None] * n
+        self._yazilan = 0
+        self._servo = [None] * n
+        self._servo_yazilan = 0
+
+    def ekle(self, kayit):
+        self._kayit[self._yazilan % self.n] = kayit
+        self._yazilan += 1
+
+    def servo(self, kimlik, t):
+        if kimlik is None:
+            return
+        self._servo[self._servo_yazilan % self.n] = (kimlik, t)
+        self._servo_yazilan += 1
+
+    def kayitlar(self, son=None):
+        """ En eskiden en yeniye, ms cinsinden (yakalamaya göre) sözlükler. """
+        servo = dict(s for s in list(self._servo) if s is not None)
+        kayitlar = sorted((k for k in list(self._kayit) if k is not None), key=lambda k: k[0])
+        if son:
+            kayitlar = kayitlar[-son:]
+
+        def ms(t, t0):
+            return None if t is None else round((t - t0) * 1000.0, 3)
+
+        cikti = []
+        for kimlik, t0, *olaylar, karar, asamalar, kodlama_s in kayitlar:
+            d = {"id": kimlik, "t_capture": round(t0, 6), "decision": karar}
+            for ad, t in zip(IZ_OLAYLARI, olaylar):
+                d[f"{ad}_ms"] = ms(t, t0)
+            d["servo_ms"] = ms(servo.get(kimlik), t0)
+            d["encode_ms"] = None if kodlama_s is None else round(kodlama_s * 1000.0, 3)
+            d["stages_ms"] = {a: round(s * 1000.0, 3) for a, s in asamalar.items()}
+            cikti.append(d)
+        return cikti
+
+    def ozet(self, kayitlar=None):
+        """ Her olay için p50/p95/p99/max (ms, yakalamaya göre). """
+        kayitlar = self.kayitlar() if kayitlar is None else kayitlar
+        ozet = {}
+        for ad in IZ_OLAYLARI + ("servo",):
+            degerler = sorted(k[f"{ad}_ms"] for k in kayitlar if k[f"{ad}_ms"] is not None)
+            if degerler:
+                ozet[ad] = {f"p{p}": degerler[min(len(degerler) - 1, len(degerler) * p // 100)]
+                            for p in (50, 95, 99)}
+                ozet[ad]["max"] = degerler[-1]
+                ozet[ad]["n"] = len(degerler)
+        return ozet
+
+    def dosyaya_yaz(self, yol):
+        """ JSON Lines: her satır bir kare kaydı. DÖNÜŞ: yazılan kayıt sayısı. """
+        import json
+
+        kayitlar = self.kayitlar()
+        with open(yol, "w", encoding="utf-8") as f:
+            for k in kayitlar:
+                f.write(json.dumps(k, ensure_ascii=False) + "\n")
+        return len(kayitlar)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Donanımsız tekrar oynatma: kayıtlı kareleri SeritTakip + karar akışından geçirir.
+
+Kaynak: JPEG/PNG klasörü, video dosyası ya da tek bir görüntü (ör. test.jpg, --repeat ile çoğaltılır).
+Servo ve motor yerine kayıt tutan taklit nesneler kullanılır; Picamera2/GPIO/gpiozero gerekmez.
+
+Örnek:
+    python replay.py test.jpg --repeat 200
+    python replay.py kayit/ --continuous --json sonuc.json
+    python replay.py surus.mp4 --quiet
+"""
+
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from SeritGoruntu import SeritTakip
+from direksiyon import gorev_dongusu_hesapla
+
+GORUNTU_UZANTILARI = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# ================== TAKLİT DONANIM ==================
+class SahteServo:
+    """ ServoKontrol ile aynı arayüz; duty cycle yazımlarını kaydeder. """
+
+    def __init__(self):
+        self.merkez_gorev_dongusu = 5.0
+        self.sag_gorev_dongusu = 6.5
+        self.sol_gorev_dongusu = 3.0
+        self.gorev_dongusu = self.merkez_gorev_dongusu
+        self.yazim = 0
+
+    def gorev_dongusu_ayarla(self, gorev_dongusu):
+        if gorev_dongusu != self.gorev_dongusu:
+            self.yazim += 1
+        self.gorev_dongusu = gorev_dongusu
+
+    def saga_don(self):
+        self.gorev_dongusu_ayarla(self.sag_gorev_dongusu)
+
+    def sola_don(self):
+        self.gorev_dongusu_ayarla(self.sol_gorev_dongusu)
+
+    def duz_git(self):
+        self.gorev_dongusu_ayarla(self.merkez_gorev_dongusu)
+
+    def set_angle(self, deger):
+        self.gorev_dongusu_ayarla(gorev_dongusu_hesapla(self, deger))
+
+    def dur(self):
+        self.duz_git()
+
+    def temizle(self):
+        pass
+
+
+class SahteArac:
+    """ dc_motor.Vehicle ile aynı arayüz; pin yazımlarını sayar. """
+
+    def __init__(self):
+        self.direction = None
+        self.left_speed = None
+        self.right_speed = None
+        self.yazim = 0
+
+    def set_state(self, direction, left, right):
+        if direction is not None and direction != self.direction:
+            self.direction = direction
+            self.yazim += 2
+        self.set_speed(left, right)
+
+    def set_speed(self, left_speed, right_speed):
+        if left_speed != self.left_speed:
+            self.left_speed = left_speed
+            self.yazim += 1
+        if right_speed != self.right_speed:
+            self.right_speed = right_speed
+            self.yazim += 1
+
+    def forward_fast(self):
+        self.set_state("forward", 1.0, 1.0)
+
+    def forward_normal(self):
+        self.set_state("forward", 0.8, 0.8)
+
+    def forward_slow(self):
+        self.set_state("forward", 0.5, 0.5)
+
+    def backward(self):
+        self.set_state("backward", 1.0, 1.0)
+
+    def stop(self):
+        self.set_speed(0, 0)
+
+
+# ================== KARE KAYNAKLARI ==================
+def kareleri_oku(kaynak, repeat=1, size=None):
+    """ (ad, BGR kare) üretir. size=(w, h) verilirse kareler yeniden boyutlanır. """
+
+    def boyutla(frame):
+        if size is not None and (frame.shape[1], frame.shape[0]) != tuple(size):
+            return cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+        return frame
+
+    if os.path.isdir(kaynak):
+        adlar = sorted(f for f in os.listdir(kaynak) if f.lower().endswith(GORUNTU_UZANTILARI))
+        for _ in range(repeat):
+            for ad in adlar:
+                frame = cv2.imread(os.path.join(kaynak, ad))
+                if frame is not None:
+                    yield ad, boyutla(frame)
+        return
+
+    if kaynak.lower().endswith(GORUNTU_UZANTILARI):
+        frame = cv2.imread(kaynak)
+        if frame is None:
+            raise SystemExit(f"Görüntü okunamadı: {kaynak}")
+        frame = boyutla(frame)
+        ad = os.path.basename(kaynak)
+        for i in range(repeat):
+            # her tur ayrı kopya → önbellek/yerinde değişiklik ölçümü bozmasın
+            yield f"{ad}#{i}", frame.copy()
+        return
+
+    for _ in range(repeat):
+        cap = cv2.VideoCapture(kaynak)
+        if not cap.isOpened():
+            raise SystemExit(f"Video açılamadı: {kaynak}")
+        i = 0
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield f"{os.path.basename(kaynak)}@{i}", boyutla(frame)
+                i += 1
+        finally:
+            cap.release()
+
+
+# ================== TEKRAR OYNATMA ==================
+def replay(kareler, serit, servo, vehicle, continuous=False, speed="fast", quiet=False):
+    """ Main.processing_thread'in AUTO akışını taklit donanımla çalıştırır; kare kayıtları döner. """
+    kayitlar = []
+    hiz = {"fast": vehicle.forward_fast, "normal": vehicle.forward_normal,
+           "slow": vehicle.forward_slow}.get(speed, vehicle.stop)
+
+    for idx, (ad, frame) in enumerate(kareler):
+        hiz()
+        h, w = frame.shape[:2]
+
+        t0 = time.perf_counter()
+        karar, lines = serit.karar_ver(frame)
+        deger = None
+        if continuous:
+            deger = serit.get_steering_value(karar)
+            servo.set_angle(deger)
+        elif karar == "Sag":
+            servo.saga_don()
+        elif karar == "Sol":
+            servo.sola_don()
+        else:
+            servo.duz_git()
+        ms = (time.perf_counter() - t0) * 1000.0
+
+        kayit = {
+            "idx": idx,
+            "frame": ad,
+            "size": [w, h],
+            "decision": karar,
+            "steer": None if deger is None else round(float(deger), 3),
+            "duty": round(float(servo.gorev_dongusu), 3),
+            "lines": 0 if lines is None else int(len(lines)),
+            "have_left": int(serit.db_have_left),
+            "have_right": int(serit.db_have_right),
+            "delta_px": int(serit.db_delta_px),
+            "last_seen": serit.last_seen,
+            "ms": round(ms, 3),
+        }
+        kayitlar.append(kayit)
+
+        if not quiet:
+            steer = "" if deger is None else f" steer={deger:+.2f}"
+            print(f"{idx:5d} {ad:<24} {karar:<8}{steer} L:{kayit['have_left']} R:{kayit['have_right']} "
+                  f"Δ:{kayit['delta_px']:+4d} lines:{kayit['lines']:3d} {ms:7.2f} ms")
+
+    return kayitlar
+
+
+def ozet(kayitlar, servo, vehicle):
+    ms = np.array([k["ms"] for k in kayitlar], dtype=np.float64)
+    kararlar = {}
+    for k in kayitlar:
+        kararlar[k["decision"]] = kararlar.get(k["decision"], 0) + 1
+    return {
+        "frames": len(kayitlar),
+        "ms_mean": round(float(ms.mean()), 3) if len(ms) else None,
+        "ms_p50": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+        "ms_p95": round(float(np.percentile(ms, 95)), 3) if len(ms) else None,
+        "fps": round(1000.0 / float(ms.mean()), 1) if len(ms) and ms.mean() > 0 else None,
+        "decisions": kararlar,
+        "servo_writes": servo.yazim,
+        "motor_writes": vehicle.yazim,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Donanımsız şerit takibi tekrar oynatma")
+    ap.add_argument("source", help="görüntü klasörü, video dosyası ya da tek görüntü")
+    ap.add_argument("--repeat", type=int, default=1, help="kaynağı kaç kez oynat")
+    ap.add_argument("--size", type=int, nargs=2, metavar=("W", "H"), help="kareleri yeniden boyutla")
+    ap.add_argument("--continuous", action="store_true", help="sürekli (PID) direksiyon")
+    ap.add_argument("--speed", default="fast", choices=("slow", "normal", "fast", "stop"))
+    ap.add_argument("--no-roi-crop", action="store_true", help="alt dilim kırpmasını kapat")
+    ap.add_argument("--json", help="kare kayıtları + özeti JSON olarak yaz")
+    ap.add_argument("--quiet", action="store_true", help="kare satırlarını yazdırma")
+    args = ap.parse_args()
+
+    serit = SeritTakip(lane_width_px=300, center_deadband_px=40, roi_crop=not args.no_roi_crop)
+    servo = SahteServo()
+    vehicle = SahteArac()
+
+    kareler = kareleri_oku(args.source, repeat=args.repeat, size=args.size)
+    kayitlar = replay(kareler, serit, servo, vehicle,
+                      continuous=args.continuous, speed=args.speed, quiet=args.quiet)
+    sonuc = ozet(kayitlar, servo, vehicle)
+    print(json.dumps(sonuc, ensure_ascii=False))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": sonuc, "frames": kayitlar}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import queue
+import threading
+import time
+
+from kare_halkasi import KareHalkasi
+
+# Çok süreçli düzen (Main.PROCESS_MODE):
+#   ana süreç   : kamera + şerit + karar + motor/servo + UDP komut kanalı
+#   web süreci  : Flask + YayinMerkezi (JPEG) + WebSocket   ← "vis" halkası, durum kuyruğu
+#   tabela süreci: TabelaDedektoru (YOLO/ONNX)               ← "ham" halkası
+# Kareler paylaşımlı bellek halkalarıyla (KareHalkasi) geçer; yalnız küçük mesajlar
+# (komut, durum, tespit) multiprocessing kuyruklarıyla taşınır.
+
+
+# ================== ANA SÜREÇ TARAFI ==================
+class HalkaYayini:
+    """ YayinMerkezi yerine geçer: overlay kare web sürecine halkayla gider (JPEG orada). """
+
+    def __init__(self, halka):
+        self.halka = halka
+
+    def kare_koy(self, frame):
+        self.halka.yaz(frame)
+
+    def isleme_bildir(self, sure_s):
+        pass   # web süreci kendi çekirdeğinde kodlar; işleme bütçesi paylaşılmaz
+
+
+class UzakTabela:
+    """
+    Ana süreçte TabelaDedektoru'nun yerine geçer (kare_istiyor / kare_koy / son_sonuc / hazir).
+    Kare ham halkaya hz ile yazılır; tespitler tabela sürecinden sonuc_q ile gelir.
+    """
+
+    def __init__(self, halka, sonuc_q, hz=3.0):
+        self.halka = halka
+        self.sonuc_q = sonuc_q
+        self.aralik = 1.0 / hz
+        self._sonraki = 0.0
+        self._sonuc = (0.0, 0.0, [])
+        self.hazir = False
+
+    def _bosalt(self):
+        while True:
+            try:
+                mesaj = self.sonuc_q.get_nowait()
+            except queue.Empty:
+                return
+            if mesaj == "hazir":
+                self.hazir = True
+            else:
+                self._sonuc = mesaj
+
+    def kare_istiyor(self, now=None):
+        self._bosalt()
+        now = time.monotonic() if now is None else now
+        return self.hazir and now >= self._sonraki
+
+    def kare_koy(self, frame, kare_zamani=None):
+        self._sonraki = time.monotonic() + self.aralik
+        self.halka.yaz(frame, kare_zamani)
+
+    def son_sonuc(self):
+        self._bosalt()
+        return self._sonuc
+
+
+def durum_yayinla(durum, durum_q, stop_event, hz=20.0):
+    """ Thread: PaylasimliDurum değiştikçe (en fazla hz) anlık görüntüyü web sürecine iter. """
+    since = -1
+    while not stop_event.is_set():
+        version, d = durum.bekle(since, 0.5)
+        if version == since:
+            continue
+        since = version
+        try:
+            durum_q.put_nowait(d)
+        except queue.Full:
+            pass   # web süreci geride → bu sürüm atlanır, sonraki gider
+        time.sleep(1.0 / hz)
+
+
+def komut_dinle(komut_q, komut_fn, stop_event):
+    """ Thread: web sürecinden gelen komutları ana süreçte uygular. """
+    while not stop_event.is_set():
+        try:
+            data = komut_q.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        komut_fn(data)
+
+
+# ================== WEB SÜRECİ TARAFI ==================
+class UzakKomut:
+    """ Web sürecinde komut_uygula yerine: komutu ana sürece iletir, yerel durum kopyasını döner. """
+
+    def __init__(self, komut_q, durum):
+        self.komut_q = komut_q
+        self.durum = durum
+
+    def __call__(self, data):
+        try:
+            self.komut_q.put_nowait(dict(data))
+        except queue.Full:
+            pass
+        return self.durum.sozluk()
+
+
+def durum_al(durum, durum_q, stop_event):
+    """ Thread: ana süreçten gelen durum görüntülerini yerel PaylasimliDurum'a yazar. """
+    while not stop_event.is_set():
+        try:
+            d = durum_q.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        durum.guncelle(**d)
+
+
+def halka_besle(halka, yayin, stop_event):
+    """ Thread: vis halkasındaki yeni kareleri YayinMerkezi'ne verir. Yuva kiralanıp
+    (yazan atlar) yerel kopyaya alınır; kodlayıcı hiçbir zaman paylaşımlı yuvayı okumaz.
+    İzleyici yoksa kopya da yapılmaz. """
+    son = 0
+    while not stop_event.is_set():
+        kimlik, _, frame = halka.al(son, timeout=0.2)
+        if frame is None:
+            continue
+        son = kimlik
+        try:
+            kopya = frame.copy() if yayin.izleyici else None
+        finally:
+            halka.birak(kimlik)
+        if kopya is not None:
+            yayin.kare_koy(kopya)
+
+
+# ================== TABELA SÜRECİ ==================
+def tabela_sureci(halka_tanim, sonuc_q, stop_event, dedektor_kw):
+    """ Süreç girişi: ham halkadan kare alır, TabelaDedektoru sonuçlarını sonuc_q'ya yazar. """
+    from tabela import TabelaDedektoru, TabelaGirdisi, TespitOnbellegi
+
+    halka = KareHalkasi.bagla(*halka_tanim)
+    dur = threading.Event()
+    kw = dict(dedektor_kw)
+    oy = kw.pop("vote", None)
+    roi = kw.pop("roi", None)
+    det = TabelaDedektoru(stop_event=dur,
+                          onbellek=TespitOnbellegi(n=oy[0], m=oy[1]) if oy else None,
+                          girdi=TabelaGirdisi(roi) if roi else None, **kw)
+    det.start()
+    while not det.hazir and det.is_alive() and not stop_event.is_set():
+        time.sleep(0.05)
+    if det.hazir:
+        sonuc_q.put("hazir")
+
+    son, son_sonuc = 0, None
+    try:
+        while not stop_event.is_set() and det.is_alive():
+            if det.kare_istiyor():
+                # yuva yalnız dedektör kare isteyince okunur; kiralı kopyalanır (yazan atlar)
+                kimlik, zaman, frame = halka.al(son, timeout=0.01)
+                if frame is not None:
+                    son = kimlik
+                    try:
+                        det.kare_koy(frame, zaman)   # ROI'yi kendi tamponuna kopyalar
+                    finally:
+                        halka.birak(kimlik)
+            else:
+                time.sleep(0.01)
+            sonuc = det.son_sonuc()
+            if sonuc is not son_sonuc:
+                son_sonuc = sonuc
+                sonuc_q.put(sonuc)
+    finally:
+        dur.set()
+        det.join(timeout=2.0)
+        halka.kapat()
@@ -0,0 +1,359 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+# Modelin tanıdığı etiketler (kamera_testt.py / vehicle_deneme.py ile aynı)
+ETIKETLER = ("dur_tabelasi", "isik_kirmizi", "isik_yesil", "otuz_hiz", "elli_hiz")
+
+
+class UltralyticsArkaUc:
+    """ YOLO (PyTorch) arka ucu; ultralytics ilk kullanımda, dedektör thread'inde içe aktarılır. """
+
+    def __init__(self, model_path, imgsz=640, conf=0.5):
+        from ultralytics import YOLO
+
+        self.model = YOLO(model_path)
+        self.names = self.model.names
+        self.imgsz = imgsz
+        self.conf = conf
+
+    def tahmin(self, img):
+        """ DÖNÜŞ: [(etiket, güven, (x1, y1, x2, y2)), ...] """
+        results = self.model.predict(source=img, save=False, imgsz=self.imgsz,
+                                     conf=self.conf, verbose=False)
+        boxes = results[0].boxes
+        if boxes is None or len(boxes) == 0:
+            return []
+        cls = boxes.cls.cpu().numpy().astype(int)
+        conf = boxes.conf.cpu().numpy()
+        xyxy = boxes.xyxy.cpu().numpy()
+        return [(self.names[c], float(p), tuple(float(v) for v in b))
+                for c, p, b in zip(cls, conf, xyxy)]
+
+
+class OnnxArkaUc:
+    """
+    model_aktar.py çıktısı (fp32/fp16/int8 ONNX) için onnxruntime arka ucu; tahmin() API'si
+    UltralyticsArkaUc ile aynı. PyTorch/ultralytics gerekmez.
+    - threads: intra-op thread sayısı (şerit döngüsüne çekirdek bırakmak için 2 iyi başlangıç).
+    - Giriş tensörü ve letterbox tamponu önceden ayrılır; kurulumda warmup kez boş çıkarım
+      yapılır (ilk gerçek karede bellek ayırma/çizelgeleme gecikmesi olmasın).
+    - YOLOv8 (1, 4+nc, N) ve YOLOv5 (1, N, 5+nc) çıktılarını çözer; sınıf bazlı NMS.
+    """
+
+    def __init__(self, model_path, imgsz=None, conf=0.5, iou=0.45, threads=2, warmup=2):
+        import onnxruntime as ort
+
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = threads
+        so.inter_op_num_threads = 1
+        so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.sess = ort.InferenceSession(model_path, so, providers=["CPUExecutionProvider"])
+
+        giris = self.sess.get_inputs()[0]
+        self._giris_adi = giris.name
+        meta = self._meta(model_path)
+        sabit = giris.shape[2] if isinstance(giris.shape[2], int) else None
+        self.imgsz = sabit or imgsz or meta.get("imgsz", 640)
+        self.names = {int(k): v for k, v in meta.get("names", dict(enumerate(ETIKETLER))).items()}
+        self.conf = conf
+        self.iou = iou
+
+        dtype = np.float16 if giris.type == "tensor(float16)" else np.float32
+        self._lb = np.empty((self.imgsz, self.imgsz, 3), np.uint8)
+        self._x = np.zeros((1, 3, self.imgsz, self.imgsz), dtype)
+        for _ in range(warmup):
+            self.sess.run(None, {self._giris_adi: self._x})
+
+    def _meta(self, model_path):
+        """ Etiketler/imgsz: önce model_aktar.py yan dosyası, yoksa ONNX metadatası. """
+        yan = os.path.splitext(model_path)[0] + ".json"
+        if os.path.exists(yan):
+            with open(yan, encoding="utf-8") as f:
+                return json.load(f)
+        import ast
+
+        props = self.sess.get_modelmeta().custom_metadata_map
+        meta = {}
+        if "names" in props:
+            meta["names"] = ast.literal_eval(props["names"])
+        if "imgsz" in props:
+            meta["imgsz"] = ast.literal_eval(props["imgsz"])[0]
+        return meta
+
+    def tahmin(self, img):
+        """ DÖNÜŞ: [(etiket, güven, (x1, y1, x2, y2)), ...] (img koordinatlarında) """
+        r, dx, dy = letterbox(img, self._lb)
+        # BGR HWC uint8 → RGB CHW [0, 1], önceden ayrılmış tensöre
+        np.multiply(self._lb[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0,
+                    out=self._x[0], casting="unsafe")
+        out = self.sess.run(None, {self._giris_adi: self._x})[0][0].astype(np.float32)
+
+        nc = len(self.names)
+        if out.shape[0] < out.shape[1]:
+            out = out.T                              # v8: (4+nc, N) → (N, 4+nc)
+        if out.shape[1] == 5 + nc:                   # v5: nesnellik × sınıf skoru
+            skor = out[:, 5:] * out[:, 4:5]
+        else:
+            skor = out[:, 4:4 + nc]
+        cls = skor.argmax(1)
+        p = skor[np.arange(len(cls)), cls]
+        sec = p >= self.conf
+        if not sec.any():
+            return []
+        kutu, p, cls = out[sec, :4], p[sec], cls[sec]
+
+        # cx, cy, w, h (letterbox) → x1, y1, x2, y2 (img)
+        xyxy = np.empty_like(kutu)
+        xyxy[:, 0] = (kutu[:, 0] - kutu[:, 2] / 2 - dx) / r
+        xyxy[:, 1] = (kutu[:, 1] - kutu[:, 3] / 2 - dy) / r
+        xyxy[:, 2] = (kutu[:, 0] + kutu[:, 2] / 2 - dx) / r
+        xyxy[:, 3] = (kutu[:, 1] + kutu[:, 3] / 2 - dy) / r
+
+        # sınıf bazlı NMS: her sınıfı ayrı bir bölgeye kaydır
+        kaydir = cls[:, None] * 4096.0
+        xywh = np.concatenate((xyxy[:, :2] + kaydir, xyxy[:, 2:] - xyxy[:, :2]), axis=1)
+        tut = cv2.dnn.NMSBoxes(xywh.tolist(), p.tolist(), self.conf, self.iou)
+        return [(self.names[int(cls[i])], float(p[i]), tuple(float(v) for v in xyxy[i]))
+                for i in np.asarray(tut).reshape(-1)]
+
+
+def letterbox(img, hedef):
+    """ img'yi oranı koruyarak kare hedef tampona yerleştirir (gri dolgu). DÖNÜŞ: (r, dx, dy) """
+    s = hedef.shape[0]
+    h, w = img.shape[:2]
+    r = min(s / h, s / w)
+    nw, nh = int(round(w * r)), int(round(h * r))
+    dx, dy = (s - nw) // 2, (s - nh) // 2
+    hedef[...] = 114
+    hedef[dy:dy + nh, dx:dx + nw] = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return r, dx, dy
+
+
+def arka_uc_kur(model_path, imgsz=640, conf=0.5, threads=2):
+    """ Uzantıya göre arka uç: .onnx → OnnxArkaUc, diğerleri → UltralyticsArkaUc. """
+    if model_path.lower().endswith(".onnx"):
+        return OnnxArkaUc(model_path, imgsz=imgsz, conf=conf, threads=threads)
+    return UltralyticsArkaUc(model_path, imgsz=imgsz, conf=conf)
+
+
+class TabelaGirdisi:
+    """
+    Dedektör girdi aşaması: tabelalar kadrajın sağ-üst bandında, şeritler alt yarıda.
+    - roi, kare boyuna oranla (x0, y0, x1, y1); kes() yalnız bu bandı önceden ayrılmış
+      tampona kopyalar (tam kare kopyası ve tam kare letterbox yok).
+    - Dedektör bir tamponda çıkarım yaparken yenisi diğerine yazılır (tampon=2 yeter:
+      yeni kare ancak dedektör öncekini aldıktan sonra verilir).
+    - geri_esle() kutuları tam kare koordinatlarına taşır.
+    """
+
+    def __init__(self, roi=(0.5, 0.0, 1.0, 0.6), tampon=2):
+        self.roi = roi
+        self.tampon = tampon
+        self._bufs = []
+        self._sira = 0
+        self._shape = None
+        self.x0 = self.y0 = 0
+
+    def _hazirla(self, frame):
+        h, w = frame.shape[:2]
+        x0, y0, x1, y1 = self.roi
+        self.x0, self.y0 = int(w * x0), int(h * y0)
+        self._x1, self._y1 = int(w * x1), int(h * y1)
+        shape = (self._y1 - self.y0, self._x1 - self.x0) + frame.shape[2:]
+        self._bufs = [np.empty(shape, dtype=frame.dtype) for _ in range(self.tampon)]
+        self._shape = frame.shape
+
+    def kes(self, frame):
+        if frame.shape != self._shape:
+            self._hazirla(frame)
+        buf = self._bufs[self._sira]
+        self._sira = (self._sira + 1) % self.tampon
+        np.copyto(buf, frame[self.y0:self._y1, self.x0:self._x1])
+        return buf
+
+    def geri_esle(self, tespitler):
+        dx, dy = self.x0, self.y0
+        return [(e, p, (x1 + dx, y1 + dy, x2 + dx, y2 + dy))
+                for e, p, (x1, y1, x2, y2) in tespitler]
+
+
+class TespitOnbellegi:
+    """
+    Etiket başına son M çıkarımın halka tamponu (görüldü/görülmedi) ile zamansal oylama.
+    - Bir etiket, son M sonucun en az N'inde görülürse onaylanır (tek karelik yanlışlar elenir).
+    - Onaylı tüm etiketler son çıkarımda da görüldüyse atlama_bitisi()'ne (son çıkarım +
+      dogrulama_s) kadar dedektör çıkarım yapmaz, önbellekteki onaylı sonucu tazeler.
+    - Onaylı bir etiket son çıkarımda kaçarsa atlama durur (tam hızda doğrulanır). Oy N'in
+      altına düşen etiket yayınlanmaz ama kaydı durur; kayıt yalnız son M çıkarımın hiçbirinde
+      görülmeyince ya da unutma_s boyunca görülmeyince silinir.
+    Kilit yok: yalnız dedektör thread'i kullanır (TabelaDedektoru.run).
+    """
+
+    def __init__(self, n=2, m=3, dogrulama_s=1.0, unutma_s=2.0):
+        self.n = n
+        self.m = m
+        self.dogrulama_s = dogrulama_s
+        self.unutma_s = unutma_s
+
+        self._gecmis = {}      # etiket → deque[bool] (son M çıkarım)
+        self._son = {}         # etiket → (güven, kutu, görülme zamanı)
+        self._son_cikarim = -1e9
+        self._son_hepsi_goruldu = False
+
+    def ekle(self, tespitler, now):
+        """ Gerçek çıkarım sonucu (her etiketin en güvenli kutusu tutulur). """
+        en_iyi = {}
+        for etiket, p, kutu in tespitler:
+            if etiket not in en_iyi or p > en_iyi[etiket][0]:
+                en_iyi[etiket] = (p, kutu)
+
+        for etiket in set(self._gecmis) | set(en_iyi):
+            g = self._gecmis.setdefault(etiket, deque(maxlen=self.m))
+            g.append(etiket in en_iyi)
+            if etiket in en_iyi:
+                p, kutu = en_iyi[etiket]
+                self._son[etiket] = (p, kutu, now)
+
+        onayli_onceki = [e for e in self._gecmis if self._onayli(e)]
+        self._son_hepsi_goruldu = bool(onayli_onceki) and all(e in en_iyi for e in onayli_onceki)
+        self._son_cikarim = now
+
+        # görüşten çıkan etiketleri geçersiz kıl
+        for etiket in list(self._gecmis):
+            if not any(self._gecmis[etiket]) or now - self._son[etiket][2] > self.unutma_s:
+                del self._gecmis[etiket]
+                self._son.pop(etiket, None)
+
+    def _onayli(self, etiket):
+        return sum(self._gecmis.get(etiket, ())) >= self.n
+
+    def onayli(self):
+        """ [(etiket, güven, kutu), ...] – yalnız oylamayı geçen etiketler. """
+        return [(e, self._son[e][0], self._son[e][1]) for e in self._gecmis if self._onayli(e)]
+
+    def atla(self, now):
+        return now < self.atlama_bitisi()
+
+    def atlama_bitisi(self):
+        """ Çıkarımın atlanabileceği son an (monotonic); atlanamıyorsa 0.0. """
+        return self._son_cikarim + self.dogrulama_s if self._son_hepsi_goruldu else 0.0
+
+
+class TabelaDedektoru(threading.Thread):
+    """
+    Şerit takibinin yanında, kendi thread'inde çalışan tabela/ışık dedektörü.
+    - Çıkarım en fazla hz kez/sn ve yalnız en yeni kare üzerinde yapılır.
+    - kare_istiyor() True iken işleme thread'i kare_koy(frame) ile kare verir; kopya
+      burada alınır (girdi verilirse yalnız tabela ROI'si), böylece yalnız alt hızda olur.
+    - Sonuçlar zaman damgalı yayınlanır: son_sonuc() → (kare_zamani, sonuc_zamani, tespitler).
+    - onbellek (TespitOnbellegi) verilirse yayınlanan tespitler N/M oylamasından geçer ve
+      onaylı tabela görüşteyken çıkarım atlanır. Önbelleğe yalnız dedektör thread'i dokunur:
+      atlama süresini o yayınlar, önbellekteki sonucu da o tazeler; kare_istiyor salt okur.
+    İşleme döngüsü hiçbir zaman çıkarımı beklemez.
+    """
+
+    def __init__(self, model_path, stop_event, hz=3.0, conf=0.5, imgsz=640, arka_uc=None,
+                 onbellek=None, girdi=None, threads=2):
+        super().__init__(daemon=True)
+        self.model_path = model_path
+        self.stop_event = stop_event
+        self.aralik = 1.0 / hz
+        self.conf = conf
+        self.imgsz = imgsz
+        self.arka_uc = arka_uc        # verilmezse run() içinde arka_uc_kur() ile kurulur
+        self.threads = threads        # yalnız ONNX arka ucu
+        self.onbellek = onbellek
+        self.girdi = girdi            # TabelaGirdisi; None → tam kare
+
+        self._cond = threading.Condition()
+        self._kare = None
+        self._kare_zamani = 0.0
+        self._sonraki = 0.0
+        self._sonuc = (0.0, 0.0, [])
+        self._atla_bitis = 0.0        # bu ana kadar kare istenmez (onaylı tabela görüşte)
+        self._sonraki_tazeleme = 0.0
+
+        self.hazir = False
+        self.cikarim = 0
+        self.atlanan = 0              # önbellek sayesinde yapılmayan çıkarım
+        self.son_cikarim_s = 0.0
+
+    def kare_istiyor(self, now=None):
+        now = time.monotonic() if now is None else now
+        if not self.hazir or now < self._sonraki or self._kare is not None:
+            return False
+        return now >= self._atla_bitis   # onaylı tabela hâlâ görüşte → çıkarım yok
+
+    def kare_koy(self, frame, kare_zamani=None):
+        frame = self.girdi.kes(frame) if self.girdi is not None else frame.copy()
+        with self._cond:
+            self._kare = frame
+            self._kare_zamani = time.monotonic() if kare_zamani is None else kare_zamani
+            self._sonraki = time.monotonic() + self.aralik
+            self._cond.notify()
+
+    def son_sonuc(self):
+        return self._sonuc
+
+    def _tazele(self):
+        """ Dedektör thread'i: atlama süresince önbellekteki onaylı sonucu hz ile yeniden yayınlar. """
+        now = time.monotonic()
+        if now >= self._atla_bitis or now < self._sonraki_tazeleme:
+            return
+        self._sonuc = (now, now, self.onbellek.onayli())
+        self._sonraki_tazeleme = now + self.aralik
+        self.atlanan += 1
+
+    def _kur(self):
+        if self.arka_uc is not None:
+            return True
+        if not os.path.exists(self.model_path):
+            print(f"Tabela modeli bulunamadı ({self.model_path}); tabela algılama kapalı.")
+            return False
+        try:
+            self.arka_uc = arka_uc_kur(self.model_path, imgsz=self.imgsz, conf=self.conf,
+                                       threads=self.threads)
+        except ImportError as e:
+            print(f"{e.name or e} kurulu değil; tabela algılama kapalı.")
+            return False
+        return True
+
+    def run(self):
+        if not self._kur():
+            return
+        self.hazir = True
+        while not self.stop_event.is_set():
+            with self._cond:
+                if self._kare is None:
+                    self._cond.wait(min(0.2, self.aralik))
+                frame, kare_zamani = self._kare, self._kare_zamani
+                self._kare = None
+            if frame is None:
+                if self.onbellek is not None:
+                    self._tazele()
+                continue
+
+            t0 = time.monotonic()
+            try:
+                tespitler = self.arka_uc.tahmin(frame)
+            except Exception as e:
+                print(f"Tabela çıkarımı hatası: {e}")
+                continue
+            t1 = time.monotonic()
+            if self.girdi is not None:
+                tespitler = self.girdi.geri_esle(tespitler)
+            self.son_cikarim_s = t1 - t0
+            self.cikarim += 1
+            if self.onbellek is not None:
+                self.onbellek.ekle(tespitler, t1)
+                tespitler = self.onbellek.onayli()
+                self._sonraki_tazeleme = t1 + self.aralik
+                self._atla_bitis = self.onbellek.atlama_bitisi()
+            self._sonuc = (kare_zamani, t1, tespitler)
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from direksiyon import DireksiyonAktuator
+
+
+class SahteServo:
+    sag_gorev_dongusu = 10.0
+    sol_gorev_dongusu = 5.0
+    merkez_gorev_dongusu = 7.5
+
+    def __init__(self):
+        self.yazilan = []
+
+    def gorev_dongusu_ayarla(self, dc):
+        self.yazilan.append((time.monotonic(), dc))
+
+
+class DireksiyonAktuatorTest(unittest.TestCase):
+    def test_settle_suresince_yalniz_son_komut_uygulanir(self):
+        servo = SahteServo()
+        akt = DireksiyonAktuator(servo, settle_s=0.6)   # merkez → sağ yarım tur: 0.3 sn
+        akt.start()
+        try:
+            akt.komut("Sag")
+            time.sleep(0.02)           # ilk komut uygulandı, settle başladı
+            self.assertEqual(len(servo.yazilan), 1)
+
+            for karar in ("Sol", "Duz git", "Sol"):
+                akt.komut(karar)
+                time.sleep(0.01)
+            self.assertEqual(len(servo.yazilan), 1)   # settle kısalmadı
+
+            time.sleep(0.5)
+            self.assertEqual([dc for _, dc in servo.yazilan], [10.0, 5.0])
+            self.assertGreaterEqual(servo.yazilan[1][0] - servo.yazilan[0][0], 0.28)
+        finally:
+            akt.durdur()
+
+    def test_durdur_settle_beklemesini_keser(self):
+        servo = SahteServo()
+        akt = DireksiyonAktuator(servo, settle_s=5.0)
+        akt.start()
+        akt.komut("Sag")
+        time.sleep(0.02)
+        t0 = time.monotonic()
+        akt.durdur()
+        self.assertFalse(akt.is_alive())
+        self.assertLess(time.monotonic() - t0, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
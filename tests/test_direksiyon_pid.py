@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SeritGoruntu import DireksiyonPID
+
+
+class DireksiyonPIDTest(unittest.TestCase):
+    def test_uzun_aradan_sonra_hedef_hiz_sinirli(self):
+        pid = DireksiyonPID(kp=0.007)
+        pid.hedef(0.0, now=0.0)
+        cikis = pid.hedef(1.0, now=2.0)          # 2 sn ara (STOP/MANUAL'den dönüş)
+        self.assertAlmostEqual(cikis, pid.max_rate * pid.ilk_dt)
+
+    def test_uzun_aradan_sonra_step_hiz_sinirli(self):
+        pid = DireksiyonPID(kp=0.007)
+        pid.konum(-1.0)
+        cikis = pid.step(1000, now=5.0)
+        self.assertAlmostEqual(cikis, -1.0 + pid.max_rate * pid.ilk_dt)
+
+    def test_normal_adim(self):
+        pid = DireksiyonPID(kp=0.007)
+        pid.hedef(0.0, now=0.0)
+        self.assertAlmostEqual(pid.hedef(1.0, now=0.1), 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
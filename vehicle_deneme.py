@@ -8,6 +8,8 @@ from servo_motor import ServoKontrol
 # dc_motor.py dosyasından Vehicle sınıfını içe aktarın
 from dc_motor import Vehicle
 
+from hiz_politikasi import HizPolitikasi
+
 # Eğitilmiş YOLO modelini yükle
 model = YOLO("best.pt")
 
@@ -23,8 +25,16 @@ vehicle.forward_normal()
 # Başlangıçta servo'yu varsayılan açısına getir (düz gitmek için)
 #servo_kontrol.set_angle(100) # Varsayılan olarak 90 derece düz olarak kabul edelim
 
-last_detection_time = time.time()
-detection_cooldown = 2 # Saniye cinsinden bekleme süresi
+# Tabela tepkileri zamanlı durum makinesiyle (sleep yok: kamera ve döngü durmadan akar)
+politika = HizPolitikasi(min_conf=0.7)
+HIZ_KOMUTU = {
+    "stop": vehicle.stop,
+    "slow": vehicle.forward_slow,
+    "normal": vehicle.forward_normal,
+    "fast": vehicle.forward_fast,
+}
+son_tepki = None
+istenen = "normal"   # yeşil ışıkta "fast" (politika yine durdurabilir ya da sınırlayabilir)
 
 while True:
     ret, frame = cap.read()
@@ -32,7 +42,7 @@ while True:
         print("Kamera okunamadı, çıkılıyor...")
         break
 
-    current_time = time.time()
+    current_time = time.monotonic()
 
     # Model ile tahmin yap
     results = model(frame)
@@ -40,58 +50,21 @@ while True:
     boxes = results[0].boxes
     names = model.names
 
-    max_conf = 0
-    selected_label = None
-
-    for box in boxes:
-        conf = float(box.conf[0])
-        if conf > max_conf:
-            max_conf = conf
-            cls_id = int(box.cls[0])
-            selected_label = names[cls_id]
-
-    if max_conf > 0.7 and selected_label and (current_time - last_detection_time > detection_cooldown):
-        print(f"Tespit: {selected_label}")
-
-        if selected_label == 'dur_tabelasi' or selected_label == 'isik_kirmizi':
-            print("Dur! Araç durduruluyor.")
-            vehicle.stop()
-            # Durunca servo'yu varsayılan pozisyona al
-            #servo_kontrol.set_angle(100)
-            time.sleep(3) # Bir süre dur
-            vehicle.forward_normal() # Tekrar harekete geç
-            #servo_kontrol.set_angle(100) # Tekrar düz git
-        elif selected_label == 'isik_yesil':
-            print("Yeşil ışık – geç! Araç ileri gidiyor.")
-            vehicle.forward_fast() # Yeşil ışıkta daha hızlı git
-            #servo_kontrol.set_angle(100) # Düz git
-        elif selected_label == 'otuz_hiz':
-            print("Hızı 30 yap. Araç yavaşlatılıyor.")
-            vehicle.forward_slow()
-            #servo_kontrol.set_angle(100) # Düz git
-        elif selected_label == 'elli_hiz':
-            print("Hızı 50 yap. Araç hızlandırılıyor.")
-            vehicle.forward_normal() # Normal hızı 50 olarak kabul edelim veya daha hızlı bir ayar yapın
-            #servo_kontrol.set_angle(100) # Düz git
-
-        # Eğer başka bir mantık eklemek isterseniz, burada sola/sağa dönme için işaretlere bakabilirsiniz.
-        # Örneğin, bir "saga_don_isareti" veya "sola_don_isareti" etiketi varsa:
-        # elif selected_label == 'saga_don_isareti':
-        #     print("Sağa dönülüyor.")
-        #     servo_kontrol.set_angle(45) # Sağa dönmek için servo açısını ayarla (deneyerek bulunmalı)
-        #     vehicle.sagadon() # DC motorları sağa dönmek için ayarla (kısmi hız farkı)
-        #     time.sleep(1) # Dönüş süresi
-        #     servo_kontrol.set_angle(90) # Tekrar düz git
-        #     vehicle.forward_normal() # Tekrar düz ileri git
-        # elif selected_label == 'sola_don_isareti':
-        #     print("Sola dönülüyor.")
-        #     servo_kontrol.set_angle(135) # Sola dönmek için servo açısını ayarla (deneyerek bulunmalı)
-        #     vehicle.soladon() # DC motorları sola dönmek için ayarla
-        #     time.sleep(1) # Dönüş süresi
-        #     servo_kontrol.set_angle(90) # Tekrar düz git
-        #     vehicle.forward_normal() # Tekrar düz ileri git
-
-        last_detection_time = current_time # Son algılama zamanını güncelle
+    tespitler = [(names[int(box.cls[0])], float(box.conf[0]), None) for box in boxes]
+
+    # Yeşil ışık → hızlı git; dur/kırmızı/50 tabelası → normal hıza dön
+    etiketler = {e for e, p, _ in tespitler if p >= politika.min_conf}
+    if "isik_yesil" in etiketler:
+        istenen = "fast"
+    elif etiketler & {"dur_tabelasi", "isik_kirmizi", "elli_hiz"}:
+        istenen = "normal"
+
+    hiz, tepki = politika.hiz(istenen, (current_time, current_time, tespitler), current_time)
+    HIZ_KOMUTU[hiz]()
+
+    if tepki != son_tepki:
+        print(f"Tepki: {tepki or 'yok'} → hız {hiz}")
+        son_tepki = tepki
 
     cv2.imshow("Kamera", frame)
     if cv2.waitKey(1) == ord("q"):
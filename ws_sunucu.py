@@ -0,0 +1,136 @@
+import asyncio
+import json
+import ssl
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+
+class WsSunucu(threading.Thread):
+    """
+    viewer.html için asyncio WebSocket sunucusu (kendi thread'inde, kendi event loop'uyla).
+    - video_port: her bağlantıya YayinMerkezi'nin en son JPEG'i ikili mesaj olarak itilir;
+      yavaş istemci kare atlar.
+    - ctrl_port: JSON komutlar ({"velocity": "slow|normal|fast|stop"}, ayrıca mode/speed/steer)
+      komut_fn'e verilir; tüm kontrol istemcilerine telemetry_hz ile {"telemetry": durum} itilir.
+    - Bağlantılar ?t=<token> ile doğrulanır; certfile/keyfile verilirse TLS (wss) kullanılır.
+
+    Bağımlılık: websockets (yoksa sunucu uyarı verip başlamaz, araç çalışmaya devam eder).
+    """
+
+    def __init__(self, yayin, durum_fn, komut_fn, stop_event, token,
+                 host="0.0.0.0", video_port=8765, ctrl_port=8766,
+                 certfile=None, keyfile=None, telemetry_hz=5, video_kalite=None):
+        super().__init__(daemon=True)
+        self.yayin = yayin
+        self.durum_fn = durum_fn
+        self.komut_fn = komut_fn
+        self.stop_event = stop_event
+        self.token = token
+        self.host = host
+        self.video_port = video_port
+        self.ctrl_port = ctrl_port
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.telemetry_hz = telemetry_hz
+        self.video_kalite = video_kalite   # YayinMerkezi kademesi; None → sabit kalite
+
+        self._kontrol_istemcileri = set()
+
+    # ---------- yardımcılar ----------
+    @staticmethod
+    def _yol(ws, path):
+        # websockets eski API'de path parametre, yeni API'de ws.request.path
+        if path is None:
+            req = getattr(ws, "request", None)
+            path = getattr(req, "path", None) or getattr(ws, "path", "")
+        return path or ""
+
+    def _yetkili(self, ws, path):
+        qs = parse_qs(urlparse(self._yol(ws, path)).query)
+        return qs.get("t", [None])[0] == self.token
+
+    def _ssl(self):
+        if not self.certfile:
+            return None
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(self.certfile, self.keyfile)
+        return ctx
+
+    # ---------- video ----------
+    async def _video(self, ws, path=None):
+        if not self._yetkili(ws, path):
+            await ws.close(code=4401, reason="token")
+            return
+        loop = asyncio.get_running_loop()
+        self.yayin.izleyici_ekle(self.video_kalite)
+        son_seq = 0
+        try:
+            while not self.stop_event.is_set():
+                # son_jpeg Condition ile bekler → event loop'u tutmamak için executor'da
+                seq, jpg = await loop.run_in_executor(
+                    None, self.yayin.son_jpeg, son_seq, self.video_kalite, 0.5)
+                if jpg is None:
+                    continue
+                son_seq = seq
+                # send geri basınçta bekler; bu sırada gelen kareler atlanır
+                await ws.send(jpg)
+        except Exception:
+            pass   # istemci koptu
+        finally:
+            self.yayin.izleyici_cikar(self.video_kalite)
+
+    # ---------- kontrol + telemetri ----------
+    async def _kontrol(self, ws, path=None):
+        if not self._yetkili(ws, path):
+            await ws.close(code=4401, reason="token")
+            return
+        self._kontrol_istemcileri.add(ws)
+        try:
+            async for mesaj in ws:
+                try:
+                    data = json.loads(mesaj)
+                except (TypeError, ValueError):
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                if "velocity" in data:
+                    data = dict(data, speed=data.pop("velocity"))
+                durum = self.komut_fn(data)
+                await ws.send(json.dumps({"ack": True, "telemetry": dict(durum)}))
+        except Exception:
+            pass
+        finally:
+            self._kontrol_istemcileri.discard(ws)
+
+    async def _telemetri(self):
+        aralik = 1.0 / self.telemetry_hz
+        while not self.stop_event.is_set():
+            await asyncio.sleep(aralik)
+            if not self._kontrol_istemcileri:
+                continue
+            mesaj = json.dumps({"telemetry": dict(self.durum_fn(), t=round(time.time(), 3))})
+            for ws in list(self._kontrol_istemcileri):
+                try:
+                    await ws.send(mesaj)
+                except Exception:
+                    self._kontrol_istemcileri.discard(ws)
+
+    async def _ana(self):
+        import websockets
+
+        ctx = self._ssl()
+        async with websockets.serve(self._video, self.host, self.video_port, ssl=ctx, max_queue=1), \
+                   websockets.serve(self._kontrol, self.host, self.ctrl_port, ssl=ctx):
+            print(f"WebSocket: video {self.video_port}, kontrol {self.ctrl_port}"
+                  f" ({'wss' if ctx else 'ws'})")
+            tel = asyncio.create_task(self._telemetri())
+            while not self.stop_event.is_set():
+                await asyncio.sleep(0.2)
+            tel.cancel()
+
+    def run(self):
+        try:
+            asyncio.run(self._ana())
+        except ImportError:
+            print("websockets kurulu değil; WebSocket sunucusu başlatılmadı (pip install websockets).")
@@ -0,0 +1,209 @@
+import threading
+import time
+
+import cv2
+
+from metrikler import HizSayaci
+
+# (JPEG kalitesi, ölçek) kademeleri: 0 en iyi, sonuncusu en ucuz
+KADEMELER = ((80, 1.0), (65, 1.0), (55, 0.75), (45, 0.5))
+
+
+class IstemciDenetleyici:
+    """
+    Tek izleyici için uyarlamalı kademe + hedef FPS.
+    bildir(gonderim_s): son parçanın soket yazma süresi (geri basınç). Üst üste yavaşsa
+    önce kademe düşer, en alttaysa FPS azalır; uzun süre sorunsuzsa ters sırada geri alınır.
+    """
+
+    def __init__(self, max_fps=30.0, min_fps=4.0):
+        self.max_fps = max_fps
+        self.min_fps = min_fps
+        self.fps = max_fps
+        self.kademe = 0
+        self._kotu = 0
+        self._iyi = 0
+
+    def bildir(self, gonderim_s, min_kademe=0):
+        aralik = 1.0 / self.fps
+        if gonderim_s > 0.5 * aralik:
+            self._iyi = 0
+            self._kotu += 1
+            if self._kotu >= 3:          # tek seferlik takılmaya tepki verme
+                self._kotu = 0
+                if self.kademe < len(KADEMELER) - 1:
+                    self.kademe += 1
+                else:
+                    self.fps = max(self.min_fps, self.fps * 0.75)
+        elif gonderim_s < 0.2 * aralik:
+            self._kotu = 0
+            self._iyi += 1
+            if self._iyi >= 2 * self.fps:  # ~2 sn sorunsuz → bir adım iyileş
+                self._iyi = 0
+                if self.fps < self.max_fps:
+                    self.fps = min(self.max_fps, self.fps * 1.25)
+                elif self.kademe > 0:
+                    self.kademe -= 1
+        self.kademe = max(self.kademe, min_kademe)
+
+
+class YayinMerkezi(threading.Thread):
+    """
+    Overlay karelerini JPEG'e çevirip tüm /video_feed izleyicilerine dağıtır.
+    - kare_koy(frame): işleme thread'i çağırır; beklemez, bekleyen kodlanmamış kareyi ezer.
+    - Kodlama kendi thread'inde ve yalnız en az bir izleyici varken yapılır; her kare,
+      izleyicilerin istediği her kademe için bir kez kodlanır (sabit modda tek kademe).
+    - abone(): her istemci için multipart üreteci; istemci hep en son JPEG'i alır,
+      yavaş istemci aradaki kareleri atlar (diğerlerini ve işleme döngüsünü bekletmez).
+    - Uyarlamalı modda istemci başına kalite/ölçek/FPS gönderim gecikmesine göre ayarlanır;
+      işleme döngüsü kare bütçesini aşarsa (isleme_bildir) kodlama seyrekleşir ve ucuz
+      kademelere inilir.
+    """
+
+    def __init__(self, stop_event, quality=80, frame_budget_s=1/30.0, baski_fps=8.0):
+        super().__init__(daemon=True)
+        self.stop_event = stop_event
+        self.quality = quality
+        self.frame_budget_s = frame_budget_s
+        self.baski_fps = baski_fps
+
+        self._cond = threading.Condition()
+        self._ham = None          # kodlanmayı bekleyen en son kare
+        self._jpg = {}            # kademe → en son kodlanmış JPEG (bytes); None = sabit kalite
+        self._seq = 0             # kodlanan kare sayacı
+        self._istenen = {}        # kademe → o kademeyi isteyen istemci sayısı
+
+        self.izleyici = 0         # bağlı istemci sayısı
+        self.kodlanan = 0
+        self.atlanan = 0          # yavaş istemcilerin kaçırdığı toplam kare
+
+        self.isleme_ema = 0.0     # işleme döngüsü süresi (üstel ortalama, sn)
+        self.son_kodlama_s = None # son karenin tüm kademeleri kodlama süresi
+        self.hiz = HizSayaci()    # kodlanan kare/sn (kayan pencere)
+
+    # ---------- işleme tarafı ----------
+    def kare_koy(self, frame):
+        with self._cond:
+            if self.izleyici == 0:
+                return
+            self._ham = frame
+            self._cond.notify_all()
+
+    def isleme_bildir(self, sure_s):
+        """ İşleme döngüsünün bu karedeki süresi; bütçe aşımı kodlamayı kısar. """
+        self.isleme_ema = 0.9 * self.isleme_ema + 0.1 * sure_s
+
+    @property
+    def cpu_baskisi(self):
+        return self.isleme_ema > self.frame_budget_s
+
+    # ---------- kodlayıcı ----------
+    def _kodla(self, frame, kademe):
+        if kademe is None:
+            quality, olcek = self.quality, 1.0
+        else:
+            quality, olcek = KADEMELER[kademe]
+        if olcek < 1.0:
+            frame = cv2.resize(frame, None, fx=olcek, fy=olcek, interpolation=cv2.INTER_AREA)
+        ok, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        return jpg.tobytes() if ok else None
+
+    def run(self):
+        son_kodlama = 0.0
+        while not self.stop_event.is_set():
+            with self._cond:
+                if self._ham is None:
+                    self._cond.wait(0.2)
+                frame, self._ham = self._ham, None
+                kademeler = [k for k, n in self._istenen.items() if n > 0]
+            if frame is None:
+                continue
+
+            if self.cpu_baskisi:
+                # işleme bütçeyi aşıyor → kodlamayı seyrelt, şerit takibinden CPU çalma
+                bekle = son_kodlama + 1.0 / self.baski_fps - time.monotonic()
+                if bekle > 0:
+                    continue
+            son_kodlama = time.monotonic()
+
+            yeni = {}
+            for k in kademeler:
+                jpg = self._kodla(frame, k)
+                if jpg is not None:
+                    yeni[k] = jpg
+            self.son_kodlama_s = time.monotonic() - son_kodlama
+            if not yeni:
+                continue
+            with self._cond:
+                self._jpg = yeni
+                self._seq += 1
+                self.kodlanan += 1
+                self._cond.notify_all()
+            self.hiz.tik()
+
+    # ---------- istemci tarafı ----------
+    def son_jpeg(self, son_seq, kademe=None, timeout=0.2):
+        """ son_seq'ten yeni bir JPEG gelene kadar bekler → (seq, jpg) ya da (son_seq, None). """
+        with self._cond:
+            if self._seq <= son_seq:
+                self._cond.wait_for(lambda: self._seq > son_seq or self.stop_event.is_set(), timeout)
+            if self._seq <= son_seq or not self._jpg:
+                return son_seq, None
+            jpg = self._jpg.get(kademe)
+            if jpg is None:
+                # kademe yeni değişti, bu kare onun için kodlanmadı → en yakın kademe
+                jpg = next(iter(self._jpg.values()))
+            return self._seq, jpg
+
+    def _kademe_degistir(self, eski, yeni):
+        with self._cond:
+            self._istenen[eski] -= 1
+            self._istenen[yeni] = self._istenen.get(yeni, 0) + 1
+
+    def izleyici_ekle(self, kademe=None):
+        """ Dış abone (ör. WebSocket) kaydı; kademe None → sabit kalite. """
+        with self._cond:
+            self.izleyici += 1
+            self._istenen[kademe] = self._istenen.get(kademe, 0) + 1
+
+    def izleyici_cikar(self, kademe=None):
+        with self._cond:
+            self.izleyici -= 1
+            self._istenen[kademe] -= 1
+
+    def abone(self, adaptif=True, max_fps=30.0):
+        den = IstemciDenetleyici(max_fps=max_fps) if adaptif else None
+        kademe = 0 if adaptif else None
+        self.izleyici_ekle(kademe)
+        son_seq = self._seq
+        son_gonderim = 0.0
+        try:
+            while not self.stop_event.is_set():
+                seq, jpg = self.son_jpeg(son_seq, kademe)
+                if jpg is None:
+                    continue
+                if son_seq and seq > son_seq + 1:
+                    self.atlanan += seq - son_seq - 1
+                son_seq = seq
+
+                if den is not None:
+                    # hedef FPS'i aşma (aradaki kareler atlanır)
+                    bekle = son_gonderim + 1.0 / den.fps - time.monotonic()
+                    if bekle > 0:
+                        self.stop_event.wait(bekle)
+                        continue
+
+                t0 = time.monotonic()
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + jpg + b'\r\n')
+                # üreteç, sunucu parçayı sokete yazınca devam eder → geçen süre geri basınç
+                son_gonderim = time.monotonic()
+
+                if den is not None:
+                    den.bildir(son_gonderim - t0, min_kademe=1 if self.cpu_baskisi else 0)
+                    if den.kademe != kademe:
+                        self._kademe_degistir(kademe, den.kademe)
+                        kademe = den.kademe
+        finally:
+            # istemci kopunca (GeneratorExit) sayaç düşer; izleyici kalmazsa kodlama durur
+            self.izleyici_cikar(kademe)